@@ -8,6 +8,7 @@ CREATE TABLE IF NOT EXISTS farmers (
     farm_size REAL NOT NULL,
     soil_type TEXT NOT NULL,
     water_availability TEXT NOT NULL,
+    budget REAL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -41,10 +42,15 @@ CREATE TABLE IF NOT EXISTS recommendations (
     profitability_score REAL NOT NULL,
     water_efficiency_score REAL NOT NULL,
     recommendation_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    details TEXT,
+    input_fingerprint TEXT,
     FOREIGN KEY (farmer_id) REFERENCES farmers(farmer_id),
     FOREIGN KEY (crop_id) REFERENCES crops(crop_id)
 );
 
+CREATE INDEX IF NOT EXISTS idx_recommendations_fingerprint
+    ON recommendations (farmer_id, input_fingerprint);
+
 -- Historical farming data table
 CREATE TABLE IF NOT EXISTS farming_history (
     history_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -57,4 +63,32 @@ CREATE TABLE IF NOT EXISTS farming_history (
     carbon_emissions REAL,
     FOREIGN KEY (farmer_id) REFERENCES farmers(farmer_id),
     FOREIGN KEY (crop_id) REFERENCES crops(crop_id)
-); 
\ No newline at end of file
+);
+
+-- Background analysis jobs
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    progress INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    owner TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Job results, stored in chunks for paged retrieval
+CREATE TABLE IF NOT EXISTS job_result_chunks (
+    chunk_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    FOREIGN KEY (job_id) REFERENCES jobs(job_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_result_chunks_job
+    ON job_result_chunks (job_id, chunk_index);
\ No newline at end of file
@@ -1,27 +1,45 @@
-import pandas as pd
-import numpy as np
-from sqlalchemy import create_engine, text
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from src.startup_timing import startup_timer
+
+with startup_timer.phase('import fastapi'):
+    from fastapi import FastAPI, HTTPException
+    from pydantic import BaseModel
+with startup_timer.phase('import sqlalchemy'):
+    from sqlalchemy import create_engine, text
 from typing import List, Optional
+import asyncio
 import os
+import sys
+from contextlib import asynccontextmanager
 from datetime import datetime
 
+from src.agents.state import load_agent_state
+
+@asynccontextmanager
+async def lifespan(app):
+    # Report boot cost once the app is ready to serve
+    print(startup_timer.report())
+    yield
+
 # Initialize FastAPI app
-app = FastAPI(title="Sustainable Farming AI System")
+app = FastAPI(title="Sustainable Farming AI System", lifespan=lifespan)
 
 # Database setup
 DATABASE_URL = "sqlite:///farming.db"
-engine = create_engine(DATABASE_URL)
+with startup_timer.phase('create database engine'):
+    engine = create_engine(DATABASE_URL)
 
-# Load datasets
-try:
-    farmer_data = pd.read_csv('farmer_advisor_dataset.csv')
-    market_data = pd.read_csv('market_researcher_dataset.csv')
-except FileNotFoundError:
+# Datasets are parsed, or read from the prebuilt state snapshot, on first use
+FARMER_DATA_PATH = 'farmer_advisor_dataset.csv'
+MARKET_DATA_PATH = 'market_researcher_dataset.csv'
+if not (os.path.exists(FARMER_DATA_PATH) and os.path.exists(MARKET_DATA_PATH)):
     print("Error: Dataset files not found!")
     exit(1)
 
+def get_datasets():
+    """Return the farmer and market datasets, loading them once per process."""
+    state = load_agent_state(FARMER_DATA_PATH, MARKET_DATA_PATH)
+    return state.farmer_data, state.market_data
+
 class FarmerInput(BaseModel):
     name: str
     location: str
@@ -94,7 +112,9 @@ class MarketResearcher:
 @app.post("/analyze-farming-profile", response_model=Recommendation)
 async def analyze_farming_profile(farmer_input: FarmerInput):
     try:
-        # Initialize agents
+        # Initialize agents; the first request loads the datasets off the event loop
+        loop = asyncio.get_running_loop()
+        farmer_data, market_data = await loop.run_in_executor(None, get_datasets)
         farmer_advisor = FarmerAdvisor(farmer_data)
         market_researcher = MarketResearcher(market_data)
 
@@ -177,5 +197,11 @@ def _store_recommendation(recommendation: Recommendation, farmer_input: FarmerIn
         conn.commit()
 
 if __name__ == "__main__":
+    if "--startup-report" in sys.argv:
+        # Include the lazily loaded agent state in the breakdown
+        get_datasets()
+        print(startup_timer.report())
+        sys.exit(0)
+
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
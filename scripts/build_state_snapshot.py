@@ -0,0 +1,38 @@
+import sys
+import os
+import argparse
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.state import (
+    FARMER_DATA_PATH,
+    MARKET_DATA_PATH,
+    build_agent_state,
+    snapshot_path_for,
+    write_state_snapshot
+)
+from src.startup_timing import startup_timer
+
+def main():
+    """Build the agent state snapshot that processes reading these datasets load at boot."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--farmer-data', default=FARMER_DATA_PATH, help='Farmer advisor CSV dataset')
+    parser.add_argument('--market-data', default=MARKET_DATA_PATH, help='Market researcher CSV dataset')
+    parser.add_argument(
+        '--output',
+        default=None,
+        help='Snapshot file to write (default: the file load_agent_state looks for with these datasets)'
+    )
+    args = parser.parse_args()
+    output = args.output or snapshot_path_for(args.farmer_data, args.market_data)
+
+    print("Building agent state snapshot...")
+    state = build_agent_state(args.farmer_data, args.market_data)
+    with startup_timer.phase('write state snapshot'):
+        write_state_snapshot(state, output)
+    print(startup_timer.report())
+    print(f"Agent state snapshot written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import sys
+import os
+import argparse
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analytics.parquet_export import DEFAULT_EXPORT_DIR, export_snapshots, readonly_engine
+
+def main():
+    """Export the analytics tables to Parquet snapshots."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--database', default='farming.db', help='SQLite database to export from')
+    parser.add_argument('--export-dir', default=DEFAULT_EXPORT_DIR, help='Directory for Parquet snapshots')
+    parser.add_argument('--batch-size', type=int, default=50000, help='Rows per Parquet file')
+    args = parser.parse_args()
+
+    print("Exporting Parquet snapshots...")
+    exported = export_snapshots(
+        readonly_engine(args.database),
+        export_dir=args.export_dir,
+        batch_size=args.batch_size
+    )
+    for table_name, row_count in exported.items():
+        print(f"  {table_name}: {row_count} row(s) exported")
+    print("Export completed!")
+
+if __name__ == "__main__":
+    main()
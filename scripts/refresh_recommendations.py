@@ -0,0 +1,31 @@
+import sys
+import os
+import argparse
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.database import get_session
+from src.api.recommendation_service import refresh_stale_recommendations
+
+def main():
+    """Recompute recommendations whose input fingerprint is out of date."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=None,
+        help='Maximum number of farmers to refresh in this run'
+    )
+    args = parser.parse_args()
+
+    print("Refreshing stale recommendations...")
+    session = get_session()
+    try:
+        refreshed = refresh_stale_recommendations(session, limit=args.limit)
+        print(f"Refreshed recommendations for {len(refreshed)} farmer(s)")
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    main()
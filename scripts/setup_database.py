@@ -2,6 +2,7 @@ import sys
 import os
 import pandas as pd
 from datetime import datetime
+from sqlalchemy import inspect, text
 
 # Add the project root directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,6 +16,40 @@ def create_tables():
     Base.metadata.create_all(bind=engine)
     print("Database tables created successfully!")
 
+# Columns added to existing tables since they were first created;
+# create_all only creates missing tables, so these need an ALTER TABLE
+ADDED_COLUMNS = {
+    'farmers': ['budget'],
+    'recommendations': ['details', 'input_fingerprint'],
+    'jobs': ['owner'],
+    'job_result_chunks': []
+}
+
+# Indexes replaced by ones declared on the models
+DROPPED_INDEXES = ['ix_recommendations_input_fingerprint', 'ix_job_result_chunks_job_id']
+
+def migrate_tables():
+    """Add new columns and their indexes to tables created by an older version."""
+    print("Migrating existing tables...")
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table_name, column_names in ADDED_COLUMNS.items():
+            if not inspector.has_table(table_name):
+                continue
+            table = Base.metadata.tables[table_name]
+            existing = {column['name'] for column in inspector.get_columns(table_name)}
+            for name in column_names:
+                if name in existing:
+                    continue
+                column_type = table.c[name].type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+                print(f"Added column {table_name}.{name}")
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+        for index_name in DROPPED_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+    print("Database migration completed successfully!")
+
 def load_initial_crops():
     """Load initial crop data."""
     print("Loading initial crop data...")
@@ -98,6 +133,7 @@ def main():
     
     # Create tables
     create_tables()
+    migrate_tables()
     
     # Load initial data
     load_initial_crops()
@@ -1,8 +1,11 @@
-import pandas as pd
-import numpy as np
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from pydantic import BaseModel
 
+from .practices_catalog import load_catalog
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 class FarmerProfile(BaseModel):
     name: str
     location: str
@@ -18,8 +21,20 @@ class SustainabilityMetrics(BaseModel):
     carbon_footprint: float
     biodiversity_impact: float
 
+# Weights used to fold sustainability metrics into a single score
+SUSTAINABILITY_WEIGHTS = {
+    'water_efficiency': 0.3,
+    'soil_health': 0.3,
+    'carbon_footprint': 0.2,
+    'biodiversity_impact': 0.2
+}
+
+# Estimated production cost per unit of irrigation water
+# This would use actual cost data
+COST_PER_WATER_UNIT = 0.5
+
 class FarmerAdvisor:
-    def __init__(self, historical_data: pd.DataFrame):
+    def __init__(self, historical_data: 'pd.DataFrame'):
         """Initialize the Farmer Advisor agent with historical farming data."""
         self.historical_data = historical_data
         self.soil_type_scores = {
@@ -88,18 +103,16 @@ class FarmerAdvisor:
             
             recommendations.append({
                 'crop': crop,
-                'sustainability_score': (
-                    sustainability_metrics.water_efficiency * 0.3 +
-                    sustainability_metrics.soil_health * 0.3 +
-                    sustainability_metrics.carbon_footprint * 0.2 +
-                    sustainability_metrics.biodiversity_impact * 0.2
+                'sustainability_score': sum(
+                    getattr(sustainability_metrics, metric) * weight
+                    for metric, weight in SUSTAINABILITY_WEIGHTS.items()
                 ),
                 'water_requirement': water_req,
                 'soil_compatibility': self.analyze_soil_compatibility(
                     farmer_profile.soil_type,
                     crop
                 ),
-                'estimated_cost': water_req * 0.5,  # This would use actual cost data
+                'estimated_cost': water_req * COST_PER_WATER_UNIT,
                 'sustainability_metrics': sustainability_metrics
             })
         
@@ -113,25 +126,25 @@ class FarmerAdvisor:
         selected_crop: str
     ) -> List[Dict]:
         """Generate sustainable farming practice recommendations."""
-        practices = [
-            {
-                'practice': 'Crop rotation',
-                'benefit': 'Improves soil health and reduces pest pressure',
-                'cost_impact': -0.1,  # 10% cost reduction
-                'sustainability_impact': 0.3
-            },
-            {
-                'practice': 'Drip irrigation',
-                'benefit': 'Reduces water consumption by up to 40%',
-                'cost_impact': 0.15,  # 15% cost increase
-                'sustainability_impact': 0.4
-            },
-            {
-                'practice': 'Cover cropping',
-                'benefit': 'Prevents soil erosion and improves soil fertility',
-                'cost_impact': 0.05,  # 5% cost increase
-                'sustainability_impact': 0.25
-            }
-        ]
-        
-        return practices 
\ No newline at end of file
+        return self.rank_practices(
+            selected_crop,
+            farmer_profile.soil_type,
+            farmer_profile.water_availability,
+            farmer_profile.farm_size
+        )
+
+    def rank_practices(
+        self,
+        crop: str,
+        soil_type: str,
+        water_availability: str,
+        farm_size: float
+    ) -> List[Dict]:
+        """Rank catalog practices for a profile bucket and project their cost and water impact."""
+        catalog = load_catalog()
+        water_req = self.calculate_water_requirements(crop, farm_size)
+        return catalog.apply(
+            catalog.bucket(crop, soil_type, water_availability),
+            base_cost=water_req * COST_PER_WATER_UNIT,
+            base_water=water_req
+        )
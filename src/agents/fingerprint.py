@@ -0,0 +1,39 @@
+import hashlib
+import json
+from typing import Dict
+
+# Profile fields that influence the recommendation pipeline
+FINGERPRINT_PROFILE_FIELDS = (
+    'location',
+    'farm_size',
+    'soil_type',
+    'water_availability',
+    'preferred_crops'
+)
+
+def compute_input_fingerprint(
+    profile: Dict,
+    dataset_versions: Dict[str, str],
+    scoring_weights: Dict
+) -> str:
+    """Fingerprint everything a stored recommendation was computed from."""
+    payload = {
+        'profile': {
+            field: profile.get(field) for field in FINGERPRINT_PROFILE_FIELDS
+        },
+        'datasets': dataset_versions,
+        'weights': scoring_weights
+    }
+    # Normalize the free-text profile fields so cosmetic edits do not
+    # invalidate stored results
+    for field in ('location', 'soil_type', 'water_availability'):
+        value = payload['profile'][field]
+        if isinstance(value, str):
+            payload['profile'][field] = value.strip().lower()
+    if payload['profile']['preferred_crops']:
+        payload['profile']['preferred_crops'] = sorted(
+            crop.strip().lower() for crop in payload['profile']['preferred_crops']
+        )
+
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
@@ -1,9 +1,10 @@
-import pandas as pd
-import numpy as np
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 class MarketTrend(BaseModel):
     crop: str
     current_price: float
@@ -12,8 +13,19 @@ class MarketTrend(BaseModel):
     price_trend: str
     confidence_score: float
 
+# Weights used to combine market signals into a recommendation score
+RECOMMENDATION_SCORE_WEIGHTS = {
+    'roi': 0.4,
+    'demand_score': 0.3
+}
+PRICE_TREND_SCORES = {
+    'Increasing': 0.3,
+    'Stable': 0.2,
+    'Decreasing': 0.1
+}
+
 class MarketResearcher:
-    def __init__(self, market_data: pd.DataFrame):
+    def __init__(self, market_data: 'pd.DataFrame'):
         """Initialize the Market Researcher agent with historical market data."""
         self.market_data = market_data
         self.demand_levels = ['Low', 'Medium', 'High']
@@ -21,6 +33,8 @@ class MarketResearcher:
         
     def analyze_price_trends(self, crop: str, region: str) -> Dict:
         """Analyze historical price trends for a specific crop in a region."""
+        import numpy as np
+
         # This would use actual historical price data
         mock_prices = {
             'rice': {'mean': 400, 'std': 50},
@@ -41,6 +55,8 @@ class MarketResearcher:
 
     def predict_demand(self, crop: str, region: str) -> Dict:
         """Predict future demand for a crop in a specific region."""
+        import numpy as np
+
         # This would use actual demand prediction models
         base_demand_scores = {
             'rice': 0.8,
@@ -120,16 +136,16 @@ class MarketResearcher:
         for crop in crops:
             market_trend = self.get_market_analysis(crop, region, farm_size)
             profitability = self.calculate_profitability(crop, region, farm_size)
+            demand_analysis = self.predict_demand(crop, region)
             
             report.append({
                 'crop': crop,
                 'market_trend': market_trend,
                 'profitability': profitability,
                 'recommendation_score': (
-                    (profitability['roi'] * 0.4) +
-                    (demand_analysis['demand_score'] * 0.3) +
-                    (0.3 if market_trend.price_trend == 'Increasing' else 
-                     0.2 if market_trend.price_trend == 'Stable' else 0.1)
+                    (profitability['roi'] * RECOMMENDATION_SCORE_WEIGHTS['roi']) +
+                    (demand_analysis['demand_score'] * RECOMMENDATION_SCORE_WEIGHTS['demand_score']) +
+                    PRICE_TREND_SCORES.get(market_trend.price_trend, PRICE_TREND_SCORES['Decreasing'])
                 )
             })
         
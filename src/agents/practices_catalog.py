@@ -0,0 +1,170 @@
+import hashlib
+import json
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Values the catalog is indexed by; other values only match practices that
+# apply to every crop, soil type or water level
+KNOWN_CROPS = ('rice', 'wheat', 'corn', 'soybeans')
+KNOWN_SOIL_TYPES = ('clay', 'sandy', 'loamy', 'silt')
+KNOWN_WATER_LEVELS = ('low', 'medium', 'high')
+
+# Impacts are relative changes: cost_impact=-0.1 means 10% cheaper and
+# water_impact=-0.4 means 40% less water. None means "applies to all".
+PRACTICES = [
+    {
+        'practice': 'Crop rotation',
+        'benefit': 'Improves soil health and reduces pest pressure',
+        'crops': None, 'soil_types': None, 'water_availability': None,
+        'cost_impact': -0.1, 'water_impact': 0.0, 'sustainability_impact': 0.3
+    },
+    {
+        'practice': 'Drip irrigation',
+        'benefit': 'Reduces water consumption by up to 40%',
+        'crops': ('wheat', 'corn', 'soybeans'), 'soil_types': None, 'water_availability': None,
+        'cost_impact': 0.15, 'water_impact': -0.4, 'sustainability_impact': 0.4
+    },
+    {
+        'practice': 'Cover cropping',
+        'benefit': 'Prevents soil erosion and improves soil fertility',
+        'crops': None, 'soil_types': None, 'water_availability': None,
+        'cost_impact': 0.05, 'water_impact': 0.0, 'sustainability_impact': 0.25
+    },
+    {
+        'practice': 'Alternate wetting and drying',
+        'benefit': 'Cuts paddy irrigation and methane emissions without yield loss',
+        'crops': ('rice',), 'soil_types': ('clay', 'loamy', 'silt'), 'water_availability': None,
+        'cost_impact': -0.05, 'water_impact': -0.3, 'sustainability_impact': 0.35
+    },
+    {
+        'practice': 'Laser land leveling',
+        'benefit': 'Evens water distribution and reduces runoff',
+        'crops': ('rice', 'wheat'), 'soil_types': None, 'water_availability': None,
+        'cost_impact': 0.08, 'water_impact': -0.2, 'sustainability_impact': 0.2
+    },
+    {
+        'practice': 'Mulching',
+        'benefit': 'Retains soil moisture and suppresses weeds',
+        'crops': None, 'soil_types': ('sandy', 'loamy', 'silt'), 'water_availability': ('low', 'medium'),
+        'cost_impact': 0.03, 'water_impact': -0.15, 'sustainability_impact': 0.2
+    },
+    {
+        'practice': 'Rainwater harvesting',
+        'benefit': 'Supplements irrigation during dry spells',
+        'crops': None, 'soil_types': None, 'water_availability': ('low',),
+        'cost_impact': 0.1, 'water_impact': -0.25, 'sustainability_impact': 0.3
+    },
+    {
+        'practice': 'Conservation tillage',
+        'benefit': 'Reduces erosion, fuel use and soil carbon loss',
+        'crops': ('wheat', 'corn', 'soybeans'), 'soil_types': ('loamy', 'silt', 'clay'), 'water_availability': None,
+        'cost_impact': -0.08, 'water_impact': -0.05, 'sustainability_impact': 0.25
+    },
+    {
+        'practice': 'Legume intercropping',
+        'benefit': 'Fixes nitrogen and reduces fertilizer needs',
+        'crops': ('corn', 'wheat'), 'soil_types': None, 'water_availability': ('medium', 'high'),
+        'cost_impact': -0.06, 'water_impact': 0.05, 'sustainability_impact': 0.3
+    },
+    {
+        'practice': 'Integrated pest management',
+        'benefit': 'Reduces pesticide use through monitoring and biological control',
+        'crops': None, 'soil_types': None, 'water_availability': None,
+        'cost_impact': -0.04, 'water_impact': 0.0, 'sustainability_impact': 0.2
+    }
+]
+
+# Weights used to rank applicable practices
+RANKING_WEIGHTS = {
+    'sustainability_impact': 1.0,
+    'water_savings': 0.5,
+    'cost_savings': 0.5
+}
+
+class PracticesCatalog:
+    """Sustainable practices with impact vectors, indexed by (crop, soil_type, water_availability)."""
+
+    def __init__(self, practices: List[Dict]):
+        import numpy as np
+
+        self.practices = practices
+        self.cost_impact = np.array([p['cost_impact'] for p in practices])
+        self.water_impact = np.array([p['water_impact'] for p in practices])
+        self.sustainability_impact = np.array([p['sustainability_impact'] for p in practices])
+        self.rank_score = (
+            RANKING_WEIGHTS['sustainability_impact'] * self.sustainability_impact -
+            RANKING_WEIGHTS['water_savings'] * self.water_impact -
+            RANKING_WEIGHTS['cost_savings'] * self.cost_impact
+        )
+        self.version = hashlib.sha256(
+            json.dumps([practices, RANKING_WEIGHTS], sort_keys=True).encode()
+        ).hexdigest()[:12]
+
+        # Every known bucket is ranked up front; unknown ones on each use, so
+        # client-supplied values never grow the index
+        self._index: Dict[Tuple[str, str, str], 'np.ndarray'] = {}
+        for crop in KNOWN_CROPS:
+            for soil_type in KNOWN_SOIL_TYPES:
+                for water in KNOWN_WATER_LEVELS:
+                    self._index[(crop, soil_type, water)] = self._rank((crop, soil_type, water))
+
+    @staticmethod
+    def bucket(crop: str, soil_type: str, water_availability: str) -> Tuple[str, str, str]:
+        """Normalize a profile into the key the catalog is indexed by."""
+        return (crop.strip().lower(), soil_type.strip().lower(), water_availability.strip().lower())
+
+    def _rank(self, bucket: Tuple[str, str, str]) -> 'np.ndarray':
+        import numpy as np
+
+        def applies(allowed: Optional[Tuple[str, ...]], value: str) -> bool:
+            return allowed is None or value in allowed
+
+        crop, soil_type, water = bucket
+        mask = np.array([
+            applies(p['crops'], crop) and
+            applies(p['soil_types'], soil_type) and
+            applies(p['water_availability'], water)
+            for p in self.practices
+        ])
+        indices = np.flatnonzero(mask)
+        # Stable sort keeps catalog order between equally ranked practices
+        return indices[np.argsort(-self.rank_score[indices], kind='stable')]
+
+    def lookup(self, bucket: Tuple[str, str, str]) -> 'np.ndarray':
+        """Indices of the practices applicable to ``bucket``, best first."""
+        indices = self._index.get(bucket)
+        return indices if indices is not None else self._rank(bucket)
+
+    def apply(
+        self,
+        bucket: Tuple[str, str, str],
+        base_cost: float,
+        base_water: float
+    ) -> List[Dict]:
+        """Rank the practices for ``bucket`` and project their effect on cost and water use."""
+        indices = self.lookup(bucket)
+        projected_cost = base_cost * (1 + self.cost_impact[indices])
+        projected_water = base_water * (1 + self.water_impact[indices])
+
+        return [
+            {
+                'practice': self.practices[i]['practice'],
+                'benefit': self.practices[i]['benefit'],
+                'cost_impact': float(self.cost_impact[i]),
+                'water_impact': float(self.water_impact[i]),
+                'sustainability_impact': float(self.sustainability_impact[i]),
+                'projected_cost': float(cost),
+                'projected_water_use': float(water),
+                'cost_change': float(cost - base_cost),
+                'water_savings': float(base_water - water)
+            }
+            for i, cost, water in zip(indices, projected_cost, projected_water)
+        ]
+
+@lru_cache(maxsize=1)
+def load_catalog() -> PracticesCatalog:
+    """Build the practices catalog once per process."""
+    return PracticesCatalog(PRACTICES)
@@ -0,0 +1,122 @@
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from .farmer_advisor import FarmerAdvisor
+from .market_researcher import MarketResearcher
+from .state import AgentState, load_agent_state, read_agent_state
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Dataset columns that identify the region a row belongs to, in order of preference
+REGION_COLUMNS = ('Region', 'region', 'Location', 'location')
+
+# Agents key shared by every region without rows of its own in the datasets
+OTHER_REGIONS = ''
+
+# Agents built so far in this process, keyed by normalized region. Only regions
+# present in the datasets get their own entry, so client-supplied region names
+# cannot grow this without bound.
+_region_agents: Dict[str, Tuple[FarmerAdvisor, MarketResearcher]] = {}
+_dataset_regions: Optional[FrozenSet[str]] = None
+_dataset_versions: Optional[Dict[str, str]] = None
+_region_lock = threading.Lock()
+
+# API processes keep the full datasets cached; shard workers read them once at
+# boot, keep only the slices for the regions they own and drop the rest
+_keep_full_state = True
+
+def normalize_region(region: str) -> str:
+    """Normalize a region name so lookups and shard assignment ignore case."""
+    return region.strip().lower()
+
+def _region_column(data: 'pd.DataFrame') -> Optional['pd.Series']:
+    for column in REGION_COLUMNS:
+        if column in data.columns:
+            return data[column].astype(str).str.strip().str.lower()
+    return None
+
+def region_subset(data: 'pd.DataFrame', region: str) -> 'pd.DataFrame':
+    """Return the rows of ``data`` that belong to ``region``.
+
+    Datasets without a region column apply to every region and are returned
+    unchanged, so all regions share one copy of them.
+    """
+    regions = _region_column(data)
+    if regions is None:
+        return data
+    return data[regions == normalize_region(region)].reset_index(drop=True)
+
+def dataset_regions(data: 'pd.DataFrame') -> FrozenSet[str]:
+    """Normalized regions that have rows in ``data``."""
+    regions = _region_column(data)
+    return frozenset() if regions is None else frozenset(regions.unique())
+
+def _read_state() -> AgentState:
+    # Caller holds _region_lock
+    global _dataset_regions, _dataset_versions
+    state = load_agent_state() if _keep_full_state else read_agent_state()
+    if _dataset_regions is None:
+        _dataset_regions = dataset_regions(state.farmer_data) | dataset_regions(state.market_data)
+        _dataset_versions = dict(state.dataset_versions)
+    return state
+
+def _agents_key(region: str) -> str:
+    # Caller holds _region_lock
+    if _dataset_regions is None:
+        _read_state()
+    key = normalize_region(region)
+    return key if key in _dataset_regions else OTHER_REGIONS
+
+def _build_agents(
+    state: AgentState,
+    keys: Iterable[str]
+) -> None:
+    # Caller holds _region_lock
+    for key in keys:
+        if key not in _region_agents:
+            _region_agents[key] = (
+                FarmerAdvisor(region_subset(state.farmer_data, key)),
+                MarketResearcher(region_subset(state.market_data, key))
+            )
+
+def load_regions(regions: Iterable[str]) -> None:
+    """Build agents for ``regions`` from one read of the agent state."""
+    with _region_lock:
+        missing = {_agents_key(region) for region in regions} - set(_region_agents)
+        if missing:
+            _build_agents(_read_state(), missing)
+
+def region_agents(region: str) -> Tuple[FarmerAdvisor, MarketResearcher]:
+    """Return the farmer advisor and market researcher for ``region``."""
+    with _region_lock:
+        key = _agents_key(region)
+        if key not in _region_agents:
+            _build_agents(_read_state(), [key])
+        return _region_agents[key]
+
+def dataset_versions() -> Dict[str, str]:
+    """Versions of the datasets the agents in this process were built from."""
+    with _region_lock:
+        if _dataset_versions is None:
+            _read_state()
+        return dict(_dataset_versions)
+
+def init_shard_worker(
+    regions: Iterable[str],
+    owns: Optional[Callable[[str], bool]] = None
+) -> None:
+    """Process pool initializer: build agents for the regions this shard owns.
+
+    ``regions`` are preloaded by name; ``owns`` selects further regions with
+    rows in the datasets. The datasets are read once and only the owned
+    slices, plus the agents shared by regions without data, are kept.
+    """
+    global _keep_full_state
+    _keep_full_state = False
+    with _region_lock:
+        state = _read_state()
+        keys = {_agents_key(region) for region in regions} | {OTHER_REGIONS}
+        if owns is not None:
+            keys |= {region for region in _dataset_regions if owns(region)}
+        _build_agents(state, keys)
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import pickle
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from ..startup_timing import startup_timer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Dataset locations used by the API routes
+FARMER_DATA_PATH = 'data/farmer_advisor_dataset.csv'
+MARKET_DATA_PATH = 'data/market_researcher_dataset.csv'
+
+# Snapshots built offline by scripts/build_state_snapshot.py, one per pair of
+# dataset files, so processes reading different datasets never share one
+STATE_SNAPSHOT_DIR = os.environ.get('FARMING_STATE_SNAPSHOT_DIR', '.')
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class AgentState:
+    """Precomputed data the agents need, loadable from a single snapshot file."""
+
+    def __init__(
+        self,
+        farmer_data: 'pd.DataFrame',
+        market_data: 'pd.DataFrame',
+        dataset_versions: Dict[str, str],
+        sources: Dict[str, Tuple]
+    ):
+        self.farmer_data = farmer_data
+        self.market_data = market_data
+        self.dataset_versions = dataset_versions
+        self.sources = sources
+
+
+def dataset_version(data: 'pd.DataFrame') -> str:
+    """Return a content hash identifying a version of an agent dataset."""
+    import pandas as pd
+
+    if data.empty:
+        return 'empty'
+
+    digest = hashlib.sha256()
+    digest.update(','.join(map(str, data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()[:16]
+
+def _source_signature(path: str) -> Tuple:
+    """Identify a dataset file by path, size and modification time."""
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (path, None, None)
+    return (path, stat.st_size, stat.st_mtime_ns)
+
+def snapshot_path_for(
+    farmer_path: str = FARMER_DATA_PATH,
+    market_path: str = MARKET_DATA_PATH,
+    snapshot_dir: Optional[str] = None
+) -> str:
+    """Snapshot file for state built from these dataset files."""
+    sources = f"{os.path.abspath(farmer_path)}\n{os.path.abspath(market_path)}"
+    key = hashlib.sha256(sources.encode()).hexdigest()[:12]
+    return os.path.join(snapshot_dir or STATE_SNAPSHOT_DIR, f"agent_state-{key}.pkl")
+
+def _read_dataset(path: str) -> 'pd.DataFrame':
+    import pandas as pd
+
+    try:
+        return pd.read_csv(path)
+    except FileNotFoundError:
+        print(f"Warning: Dataset file {path} not found. Using mock data.")
+        return pd.DataFrame()
+
+def build_agent_state(
+    farmer_path: str = FARMER_DATA_PATH,
+    market_path: str = MARKET_DATA_PATH
+) -> AgentState:
+    """Parse the CSV datasets and precompute everything the agents need."""
+    with startup_timer.phase('import pandas'):
+        import pandas  # noqa: F401
+
+    with startup_timer.phase('parse datasets'):
+        farmer_data = _read_dataset(farmer_path)
+        market_data = _read_dataset(market_path)
+
+    with startup_timer.phase('hash datasets'):
+        dataset_versions = {
+            'farmer_advisor': dataset_version(farmer_data),
+            'market_researcher': dataset_version(market_data)
+        }
+
+    return AgentState(
+        farmer_data,
+        market_data,
+        dataset_versions,
+        sources={
+            'farmer_advisor': _source_signature(farmer_path),
+            'market_researcher': _source_signature(market_path)
+        }
+    )
+
+def write_state_snapshot(state: AgentState, path: str) -> None:
+    """Pickle ``state`` so workers can skip CSV parsing at boot."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(
+            {'format_version': SNAPSHOT_FORMAT_VERSION, 'state': state},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+    os.replace(tmp_path, path)
+
+def _read_state_snapshot(
+    path: str,
+    farmer_path: str,
+    market_path: str
+) -> Optional[AgentState]:
+    """Return the snapshot at ``path`` if it was built from the current datasets."""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception as e:
+        # A truncated or corrupt snapshot must not stop startup
+        print(f"Warning: Could not read state snapshot {path} ({e}). Parsing datasets instead.")
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        return None
+
+    state = snapshot['state']
+    expected_sources = {
+        'farmer_advisor': _source_signature(farmer_path),
+        'market_researcher': _source_signature(market_path)
+    }
+    if state.sources != expected_sources:
+        print(f"Warning: State snapshot {path} is out of date. Parsing datasets instead.")
+        return None
+    return state
+
+_state_lock = threading.Lock()
+
+def load_agent_state(
+    farmer_path: str = FARMER_DATA_PATH,
+    market_path: str = MARKET_DATA_PATH,
+    snapshot_path: Optional[str] = None
+) -> AgentState:
+    """Load agent state once per process, preferring an up-to-date snapshot.
+
+    ``snapshot_path`` defaults to the snapshot built from these datasets.
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(farmer_path, market_path)
+    # Concurrent first requests wait for one load instead of each parsing the datasets
+    with _state_lock:
+        return _load_agent_state(farmer_path, market_path, snapshot_path)
+
+@lru_cache(maxsize=None)
+def _load_agent_state(
+    farmer_path: str,
+    market_path: str,
+    snapshot_path: str
+) -> AgentState:
+    return read_agent_state(farmer_path, market_path, snapshot_path)
+
+def read_agent_state(
+    farmer_path: str = FARMER_DATA_PATH,
+    market_path: str = MARKET_DATA_PATH,
+    snapshot_path: Optional[str] = None
+) -> AgentState:
+    """Read agent state without caching it, for callers that keep only slices of it."""
+    snapshot_path = snapshot_path or snapshot_path_for(farmer_path, market_path)
+    with startup_timer.phase('load agent state'):
+        with startup_timer.phase('read state snapshot'):
+            state = _read_state_snapshot(snapshot_path, farmer_path, market_path)
+        if state is None:
+            state = build_agent_state(farmer_path, market_path)
+    return state
@@ -0,0 +1,191 @@
+import json
+import os
+import shutil
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import DateTime, Float, Integer, Table, create_engine, select
+from sqlalchemy.engine import Engine
+
+from ..database.models import Farmer, FarmingHistory, Recommendation
+
+DEFAULT_EXPORT_DIR = "exports"
+WATERMARK_FILE = "_watermarks.json"
+
+# Tables exported for analytics, keyed by name, with their primary key column
+EXPORT_TABLES = {
+    'farmers': (Farmer.__table__, 'farmer_id'),
+    'recommendations': (Recommendation.__table__, 'recommendation_id'),
+    'farming_history': (FarmingHistory.__table__, 'history_id')
+}
+
+# Small tables whose rows are edited in place (e.g. PUT /farmers/{id}); they
+# are re-exported in full each run since a key watermark misses updates
+FULL_EXPORT_TABLES = {'farmers'}
+
+# Arrow types for the SQLAlchemy column types used in the models; anything
+# else is exported as a string
+ARROW_TYPES = {
+    Integer: pa.int64(),
+    Float: pa.float64(),
+    DateTime: pa.timestamp('us')
+}
+
+def arrow_schema(table: Table) -> pa.Schema:
+    """Fixed Arrow schema for a table so every exported part has the same types."""
+    return pa.schema([
+        (column.name, ARROW_TYPES.get(type(column.type), pa.string()))
+        for column in table.columns
+    ])
+
+def readonly_engine(database_path: str = "farming.db") -> Engine:
+    """Open the serving SQLite database read-only so exports never take a write lock."""
+    return create_engine(
+        f"sqlite:///file:{database_path}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False}
+    )
+
+def load_watermarks(export_dir: str = DEFAULT_EXPORT_DIR) -> Dict[str, int]:
+    """Return the highest primary key exported so far for each incrementally exported table."""
+    path = os.path.join(export_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def _save_watermarks(watermarks: Dict[str, int], export_dir: str) -> None:
+    path = os.path.join(export_dir, WATERMARK_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(watermarks, f, indent=2, sort_keys=True)
+    # Atomic replace so a crashed export never leaves a torn watermark file
+    os.replace(tmp_path, path)
+
+def _read_batches(
+    engine: Engine,
+    table: Table,
+    pk_name: str,
+    batch_size: int,
+    after: int = 0
+) -> Iterator[Tuple[List[str], List]]:
+    """Yield rows with a primary key above ``after`` in primary-key order, in batches.
+
+    Each batch is read on its own connection, so each read holds the SQLite
+    shared lock only briefly.
+    """
+    pk = table.c[pk_name]
+    while True:
+        with engine.connect() as conn:
+            result = conn.execute(
+                select(table).where(pk > after).order_by(pk).limit(batch_size)
+            )
+            columns = list(result.keys())
+            rows = result.fetchall()
+        if not rows:
+            return
+
+        yield columns, rows
+        after = rows[-1][columns.index(pk_name)]
+        if len(rows) < batch_size:
+            return
+
+def _write_batch(
+    columns: List[str],
+    rows: List,
+    schema: pa.Schema,
+    pk_name: str,
+    partition_dir: str
+) -> int:
+    """Write one batch as a Parquet file named after its primary-key range; returns the last key."""
+    batch = pa.Table.from_pydict(
+        {column: [row[i] for row in rows] for i, column in enumerate(columns)},
+        schema=schema
+    )
+    first_pk, last_pk = rows[0][columns.index(pk_name)], rows[-1][columns.index(pk_name)]
+
+    os.makedirs(partition_dir, exist_ok=True)
+    pq.write_table(
+        batch,
+        os.path.join(partition_dir, f"part-{first_pk:012d}-{last_pk:012d}.parquet")
+    )
+    return last_pk
+
+def export_table(
+    engine: Engine,
+    table_name: str,
+    export_dir: str = DEFAULT_EXPORT_DIR,
+    batch_size: int = 50000,
+    export_date: Optional[date] = None
+) -> int:
+    """Export ``table_name`` to Parquet; returns the number of rows exported.
+
+    Tables in FULL_EXPORT_TABLES replace their snapshot with every current
+    row; the others only export rows added since the last run. Each batch of
+    ``batch_size`` rows becomes one file under
+    ``<export_dir>/<table>/export_date=<date>/`` named after the primary-key
+    range it covers.
+    """
+    if table_name in FULL_EXPORT_TABLES:
+        return _export_full_table(engine, table_name, export_dir, batch_size, export_date)
+
+    table, pk_name = EXPORT_TABLES[table_name]
+    schema = arrow_schema(table)
+    partition = f"export_date={(export_date or date.today()).isoformat()}"
+    partition_dir = os.path.join(export_dir, table_name, partition)
+
+    watermarks = load_watermarks(export_dir)
+    exported = 0
+    for columns, rows in _read_batches(
+        engine, table, pk_name, batch_size, after=watermarks.get(table_name, 0)
+    ):
+        # Advance the watermark only once the batch is safely on disk
+        watermarks[table_name] = _write_batch(columns, rows, schema, pk_name, partition_dir)
+        _save_watermarks(watermarks, export_dir)
+        exported += len(rows)
+
+    return exported
+
+def _export_full_table(
+    engine: Engine,
+    table_name: str,
+    export_dir: str,
+    batch_size: int,
+    export_date: Optional[date]
+) -> int:
+    # Written to a staging directory and swapped in whole, so readers never
+    # see a mix of old and new rows
+    table, pk_name = EXPORT_TABLES[table_name]
+    schema = arrow_schema(table)
+    partition = f"export_date={(export_date or date.today()).isoformat()}"
+    table_dir = os.path.join(export_dir, table_name)
+    staging_dir = table_dir + ".staging"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    exported = 0
+    for columns, rows in _read_batches(engine, table, pk_name, batch_size):
+        _write_batch(columns, rows, schema, pk_name, os.path.join(staging_dir, partition))
+        exported += len(rows)
+
+    previous_dir = table_dir + ".previous"
+    shutil.rmtree(previous_dir, ignore_errors=True)
+    if os.path.exists(table_dir):
+        os.replace(table_dir, previous_dir)
+    os.replace(staging_dir, table_dir)
+    shutil.rmtree(previous_dir, ignore_errors=True)
+    return exported
+
+def export_snapshots(
+    engine: Optional[Engine] = None,
+    export_dir: str = DEFAULT_EXPORT_DIR,
+    batch_size: int = 50000
+) -> Dict[str, int]:
+    """Export every analytics table; returns rows exported per table."""
+    engine = engine or readonly_engine()
+    os.makedirs(export_dir, exist_ok=True)
+    return {
+        table_name: export_table(engine, table_name, export_dir, batch_size)
+        for table_name in EXPORT_TABLES
+    }
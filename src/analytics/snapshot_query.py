@@ -0,0 +1,82 @@
+import os
+from typing import Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .parquet_export import DEFAULT_EXPORT_DIR, EXPORT_TABLES, arrow_schema
+
+# Aggregations accepted by grouped_aggregate
+SUPPORTED_AGGREGATIONS = ('mean', 'sum', 'min', 'max', 'count', 'stddev')
+
+def load_snapshot(
+    table_name: str,
+    export_dir: str = DEFAULT_EXPORT_DIR,
+    columns: Optional[List[str]] = None
+) -> pa.Table:
+    """Read the exported Parquet snapshot of ``table_name`` as an Arrow table."""
+    table, _ = EXPORT_TABLES[table_name]
+    schema = arrow_schema(table)
+    table_dir = os.path.join(export_dir, table_name)
+    if not os.path.isdir(table_dir):
+        return schema.empty_table().select(columns or schema.names)
+
+    dataset = ds.dataset(table_dir, format="parquet", partitioning="hive", schema=schema)
+    return dataset.to_table(columns=columns)
+
+def grouped_aggregate(
+    data: pa.Table,
+    group_by: Sequence[str],
+    aggregations: Dict[str, str]
+) -> List[Dict]:
+    """Aggregate ``data`` per group, e.g. ``{'sustainability_score': 'mean'}``."""
+    for column, aggregation in aggregations.items():
+        if aggregation not in SUPPORTED_AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation '{aggregation}' for {column}")
+
+    # Output column order differs between pyarrow versions, so rows are
+    # read back by name; pyarrow names aggregates "<column>_<aggregation>"
+    count_column = next(iter(aggregations))
+    result = data.group_by(list(group_by)).aggregate(
+        [(column, aggregation) for column, aggregation in aggregations.items()]
+        + [(count_column, 'count')]
+    )
+    return [
+        {
+            **{key: row[key] for key in group_by},
+            **{
+                f"{column}_{aggregation}": row[f"{column}_{aggregation}"]
+                for column, aggregation in aggregations.items()
+            },
+            'row_count': row[f"{count_column}_count"]
+        }
+        for row in result.to_pylist()
+    ]
+
+def average_scores_by(
+    group_by: Sequence[str] = ('soil_type', 'location'),
+    export_dir: str = DEFAULT_EXPORT_DIR
+) -> List[Dict]:
+    """Average recommendation scores grouped by farmer attributes such as soil type and region."""
+    recommendations = load_snapshot(
+        'recommendations',
+        export_dir,
+        columns=[
+            'farmer_id',
+            'sustainability_score',
+            'profitability_score',
+            'water_efficiency_score'
+        ]
+    )
+    farmers = load_snapshot('farmers', export_dir, columns=['farmer_id', *group_by])
+    joined = recommendations.join(farmers, keys='farmer_id', join_type='inner')
+
+    return grouped_aggregate(
+        joined,
+        group_by,
+        {
+            'sustainability_score': 'mean',
+            'profitability_score': 'mean',
+            'water_efficiency_score': 'mean'
+        }
+    )
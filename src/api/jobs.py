@@ -0,0 +1,328 @@
+import json
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..database.database import get_db, get_session
+from ..database.models import Farmer, Job, JobResultChunk
+from .pipeline import build_market_report
+from .recommendation_service import rescore_farmer
+from .shard_router import get_shard_router
+
+# Bounded concurrency for batch work, separate from the request handlers
+JOB_WORKERS = int(os.environ.get('FARMING_JOB_WORKERS', '2'))
+MAX_PENDING_JOBS = int(os.environ.get('FARMING_MAX_PENDING_JOBS', '100'))
+
+# Number of result items stored per chunk
+RESULT_CHUNK_SIZE = 50
+
+DEFAULT_CROPS = ['rice', 'wheat', 'corn', 'soybeans']
+
+router = APIRouter(prefix="/jobs")
+
+class JobRequest(BaseModel):
+    job_type: str
+    parameters: Dict = {}
+
+class JobQueueFullError(Exception):
+    """Raised when too many jobs are already queued or running."""
+
+def _farmers_in_region(db: Session, region: str) -> List[Farmer]:
+    return db.execute(
+        select(Farmer)
+        .where(func.lower(Farmer.location) == region.strip().lower())
+        .order_by(Farmer.farmer_id)
+    ).scalars().all()
+
+def _region_report(db: Session, parameters: Dict) -> Tuple[int, Iterable[Dict]]:
+    """Market analysis for a region plus up-to-date recommendations for its farmers."""
+    region = parameters['region']
+    crops = parameters.get('crops') or DEFAULT_CROPS
+    farmers = _farmers_in_region(db, region)
+
+    def items():
+        yield {
+            'section': 'market_analysis',
+            'region': region,
+            'market_analysis': get_shard_router().call(region, build_market_report, crops, region)
+        }
+        for farmer in farmers:
+            yield {
+                'section': 'recommendations',
+                'farmer_id': farmer.farmer_id,
+                'recommendations': rescore_farmer(db, farmer)
+            }
+
+    return 1 + len(farmers), items()
+
+def _rescore_farmers(db: Session, parameters: Dict) -> Tuple[int, Iterable[Dict]]:
+    """Bring recommendations up to date for a list of farmers or a whole region."""
+    if parameters.get('farmer_ids'):
+        farmers = db.execute(
+            select(Farmer)
+            .where(Farmer.farmer_id.in_(parameters['farmer_ids']))
+            .order_by(Farmer.farmer_id)
+        ).scalars().all()
+    elif parameters.get('region'):
+        farmers = _farmers_in_region(db, parameters['region'])
+    else:
+        raise ValueError("rescore_farmers needs 'farmer_ids' or 'region'")
+
+    def items():
+        for farmer in farmers:
+            yield {
+                'farmer_id': farmer.farmer_id,
+                'recommendations': rescore_farmer(db, farmer)
+            }
+
+    return len(farmers), items()
+
+def _check_crops(parameters: Dict) -> None:
+    crops = parameters.get('crops')
+    if crops is not None and not (
+        isinstance(crops, list) and all(isinstance(crop, str) for crop in crops)
+    ):
+        raise ValueError("'crops' must be a list of strings")
+
+def _validate_region_report(parameters: Dict) -> None:
+    region = parameters.get('region')
+    if not isinstance(region, str) or not region.strip():
+        raise ValueError("region_report needs a 'region' string")
+    _check_crops(parameters)
+
+def _validate_rescore_farmers(parameters: Dict) -> None:
+    farmer_ids = parameters.get('farmer_ids')
+    region = parameters.get('region')
+    if farmer_ids is not None and not (
+        isinstance(farmer_ids, list) and
+        all(isinstance(farmer_id, int) and not isinstance(farmer_id, bool) for farmer_id in farmer_ids)
+    ):
+        raise ValueError("'farmer_ids' must be a list of integers")
+    if region is not None and not isinstance(region, str):
+        raise ValueError("'region' must be a string")
+    if not farmer_ids and not (region and region.strip()):
+        raise ValueError("rescore_farmers needs 'farmer_ids' or 'region'")
+
+# Job type -> (handler, parameter validator raising ValueError)
+JOB_TYPES: Dict[str, Tuple[Callable, Callable[[Dict], None]]] = {
+    'region_report': (_region_report, _validate_region_report),
+    'rescore_farmers': (_rescore_farmers, _validate_rescore_farmers)
+}
+
+class JobQueue:
+    """Run analysis jobs on a local thread pool and persist their progress and results."""
+
+    def __init__(self, workers: int = JOB_WORKERS, max_pending: int = MAX_PENDING_JOBS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='farming-job')
+        self._max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        # Recorded on every job this process runs; the token tells a restarted
+        # process apart from an earlier one that had the same pid
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._fail_orphaned_jobs()
+
+    def _owner_is_alive(self, owner: Optional[str]) -> bool:
+        """Whether the process that owns a job may still be running it."""
+        try:
+            host, pid, _ = owner.rsplit(':', 2)
+            pid = int(pid)
+        except (AttributeError, ValueError):
+            # Jobs created before owners were recorded
+            return False
+
+        if host != socket.gethostname():
+            # Processes on other hosts cannot be checked from here
+            return True
+        if pid == os.getpid():
+            return owner == self.owner
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _fail_orphaned_jobs(self) -> None:
+        """Fail unfinished jobs whose owning process has exited; they will never complete.
+
+        Jobs owned by other live API workers are left alone.
+        """
+        db = get_session()
+        try:
+            unfinished = db.execute(
+                select(Job.job_id, Job.owner).where(Job.status.in_(('queued', 'running')))
+            ).all()
+            orphaned = [job_id for job_id, owner in unfinished if not self._owner_is_alive(owner)]
+            if orphaned:
+                db.execute(
+                    update(Job)
+                    .where(Job.job_id.in_(orphaned), Job.status.in_(('queued', 'running')))
+                    .values(
+                        status='failed',
+                        error='Interrupted by a server restart',
+                        finished_at=datetime.utcnow()
+                    )
+                )
+                db.commit()
+        finally:
+            db.close()
+
+    def submit(self, job_type: str, parameters: Dict) -> str:
+        """Persist a new job and schedule it; returns the job id."""
+        with self._lock:
+            if self._pending >= self._max_pending:
+                raise JobQueueFullError(f"{self._pending} jobs are already pending")
+            self._pending += 1
+
+        job_id = str(uuid.uuid4())
+        db = get_session()
+        try:
+            db.add(Job(
+                job_id=job_id,
+                job_type=job_type,
+                parameters=json.dumps(parameters),
+                status='queued',
+                owner=self.owner
+            ))
+            db.commit()
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        finally:
+            db.close()
+
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def _run(self, job_id: str) -> None:
+        db = get_session()
+        try:
+            job = db.get(Job, job_id)
+            job.status = 'running'
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            handler, _ = JOB_TYPES[job.job_type]
+            job.total, items = handler(db, json.loads(job.parameters))
+            db.commit()
+
+            chunk: List[Dict] = []
+            for item in items:
+                chunk.append(item)
+                job.progress += 1
+                if len(chunk) >= RESULT_CHUNK_SIZE:
+                    self._write_chunk(db, job, chunk)
+                    chunk = []
+                db.commit()
+            if chunk:
+                self._write_chunk(db, job, chunk)
+
+            job.status = 'completed'
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            job = db.get(Job, job_id)
+            if job is not None:
+                job.status = 'failed'
+                job.error = str(e)
+                job.finished_at = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+            with self._lock:
+                self._pending -= 1
+
+    @staticmethod
+    def _write_chunk(db: Session, job: Job, items: List[Dict]) -> None:
+        db.add(JobResultChunk(
+            job_id=job.job_id,
+            chunk_index=job.chunk_count,
+            payload=json.dumps(items)
+        ))
+        job.chunk_count += 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue, creating it on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
+
+def _job_status(job: Job) -> Dict:
+    return {
+        "job_id": job.job_id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "progress": job.progress,
+        "total": job.total,
+        "chunk_count": job.chunk_count,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+@router.post("", status_code=202)
+async def create_job(job_request: JobRequest):
+    """Queue a long-running analysis and return its id for polling."""
+    if job_request.job_type not in JOB_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown job type '{job_request.job_type}'. Expected one of: {', '.join(JOB_TYPES)}"
+        )
+    _, validate = JOB_TYPES[job_request.job_type]
+    try:
+        validate(job_request.parameters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid job parameters: {e}")
+
+    try:
+        job_id = get_job_queue().submit(job_request.job_type, job_request.parameters)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return {"job_id": job_id, "status": "queued"}
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    chunk: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Poll a job's progress; pass ``chunk`` to fetch one chunk of its results."""
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    response = _job_status(job)
+    if chunk is not None:
+        result_chunk = db.execute(
+            select(JobResultChunk.payload)
+            .where(JobResultChunk.job_id == job_id, JobResultChunk.chunk_index == chunk)
+        ).first()
+        if result_chunk is None:
+            raise HTTPException(status_code=404, detail="Result chunk not found")
+        response["chunk"] = chunk
+        response["results"] = json.loads(result_chunk.payload)
+
+    return response
@@ -0,0 +1,103 @@
+import hashlib
+from fastapi.encoders import jsonable_encoder
+from functools import lru_cache
+from typing import Dict, List
+
+from ..agents.farmer_advisor import FarmerProfile, SUSTAINABILITY_WEIGHTS
+from ..agents.market_researcher import PRICE_TREND_SCORES, RECOMMENDATION_SCORE_WEIGHTS
+from ..agents import regional
+from ..agents.practices_catalog import PracticesCatalog, load_catalog
+from ..agents.regional import normalize_region, region_agents
+
+# Module-level functions so they can run in shard worker processes
+
+# Weights used to combine agent scores into the overall ranking
+OVERALL_SCORE_WEIGHTS = {
+    'sustainability': 0.4,
+    'market': 0.6
+}
+
+# Stored recommendations are recomputed when these or the dataset versions change
+SCORING_WEIGHTS = {
+    'sustainability': SUSTAINABILITY_WEIGHTS,
+    'market': RECOMMENDATION_SCORE_WEIGHTS,
+    'price_trend': PRICE_TREND_SCORES,
+    'overall': OVERALL_SCORE_WEIGHTS
+}
+
+def build_recommendations(farmer_profile: FarmerProfile) -> List[dict]:
+    """Run both agents and combine their output into ranked recommendations."""
+    farmer_advisor, market_researcher = region_agents(farmer_profile.location)
+
+    # Get recommendations from both agents
+    crop_recommendations = farmer_advisor.get_crop_recommendations(farmer_profile)
+
+    # Get market analysis for recommended crops
+    crops = [rec['crop'] for rec in crop_recommendations]
+    market_analysis = market_researcher.generate_market_report(
+        crops,
+        farmer_profile.location,
+        farmer_profile.farm_size
+    )
+
+    # Combine recommendations
+    final_recommendations = []
+    for crop_rec, market_rec in zip(crop_recommendations, market_analysis):
+        combined_rec = {
+            **crop_rec,
+            'market_analysis': market_rec,
+            'overall_score': (
+                crop_rec['sustainability_score'] * OVERALL_SCORE_WEIGHTS['sustainability'] +
+                market_rec['recommendation_score'] * OVERALL_SCORE_WEIGHTS['market']
+            )
+        }
+        final_recommendations.append(combined_rec)
+
+    # Sort by overall score
+    final_recommendations.sort(key=lambda x: x['overall_score'], reverse=True)
+
+    # Plain JSON types so fresh and stored results are served identically
+    return jsonable_encoder(final_recommendations)
+
+def build_market_report(crops: List[str], region: str) -> List[dict]:
+    """Run the market researcher for a region."""
+    _, market_researcher = region_agents(region)
+    return jsonable_encoder(market_researcher.generate_market_report(
+        crops=crops,
+        region=region,
+        farm_size=10.0  # Default farm size for analysis
+    ))
+
+def build_sustainable_practices(farmer_profile: FarmerProfile, crop: str) -> List[dict]:
+    """Run the farmer advisor's practice recommendations for the farmer's region."""
+    return _practices_for_bucket(
+        normalize_region(farmer_profile.location),
+        *PracticesCatalog.bucket(crop, farmer_profile.soil_type, farmer_profile.water_availability),
+        farmer_profile.farm_size
+    )
+
+@lru_cache(maxsize=4096)
+def _practices_for_bucket(
+    region: str,
+    crop: str,
+    soil_type: str,
+    water_availability: str,
+    farm_size: float
+) -> List[dict]:
+    # Farmers sharing a region, profile bucket and farm size get the same ranking
+    farmer_advisor, _ = region_agents(region)
+    return farmer_advisor.rank_practices(crop, soil_type, water_availability, farm_size)
+
+def practices_cache_key(farmer_profile: FarmerProfile, crop: str) -> str:
+    """Identify a practices response by catalog version, region, profile bucket and farm size."""
+    key = (
+        load_catalog().version,
+        normalize_region(farmer_profile.location),
+        *PracticesCatalog.bucket(crop, farmer_profile.soil_type, farmer_profile.water_availability),
+        farmer_profile.farm_size
+    )
+    return hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+
+def dataset_versions() -> Dict[str, str]:
+    """Versions of the datasets loaded in this process."""
+    return regional.dataset_versions()
@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..database.farmer_queries import PROFILE_FIELDS, get_farmer_profile_fields
+from ..database.models import Farmer
+from ..database.recommendation_store import (
+    find_stale_farmers,
+    load_recommendations,
+    store_recommendations
+)
+from ..agents.farmer_advisor import FarmerProfile
+from ..agents.fingerprint import compute_input_fingerprint
+from .pipeline import SCORING_WEIGHTS, build_recommendations
+from .shard_router import get_shard_router
+
+# Budget assumed for farmers created before budgets were stored
+DEFAULT_BUDGET = 10000
+
+def profile_from_fields(
+    fields: Dict,
+    preferred_crops: Optional[List[str]] = None
+) -> FarmerProfile:
+    """Build the agent-facing profile from a farmer's profile columns."""
+    return FarmerProfile(
+        name=fields['name'],
+        location=fields['location'],
+        farm_size=fields['farm_size'],
+        soil_type=fields['soil_type'],
+        water_availability=fields['water_availability'],
+        preferred_crops=preferred_crops,
+        budget=fields['budget'] if fields['budget'] is not None else DEFAULT_BUDGET
+    )
+
+def build_farmer_profile(farmer: Farmer) -> FarmerProfile:
+    """Build the agent-facing profile for a loaded farmer row."""
+    return profile_from_fields({name: getattr(farmer, name) for name in PROFILE_FIELDS})
+
+def lookup_farmer_profile(
+    db: Session,
+    farmer_id: int,
+    preferred_crops: Optional[List[str]] = None
+) -> Optional[FarmerProfile]:
+    """Return a farmer's profile via the profile cache, or None if the farmer does not exist."""
+    fields = get_farmer_profile_fields(db, farmer_id)
+    if fields is None:
+        return None
+    return profile_from_fields(fields, preferred_crops)
+
+def recommendation_fingerprint(profile: FarmerProfile) -> str:
+    """Fingerprint the profile, dataset versions and weights behind a recommendation."""
+    return compute_input_fingerprint(
+        profile.model_dump(),
+        get_shard_router().dataset_versions(),
+        SCORING_WEIGHTS
+    )
+
+def rescore_farmer(db: Session, farmer: Farmer) -> List[Dict]:
+    """Return up-to-date recommendations for ``farmer``, recomputing them only if stale.
+
+    Blocking; meant for background jobs and scripts rather than request handlers.
+    """
+    profile = build_farmer_profile(farmer)
+    fingerprint = recommendation_fingerprint(profile)
+    stored = load_recommendations(db, farmer.farmer_id, fingerprint)
+    if stored:
+        return stored[0]
+
+    recommendations = get_shard_router().call(profile.location, build_recommendations, profile)
+    store_recommendations(db, farmer.farmer_id, fingerprint, recommendations)
+    return recommendations
+
+def refresh_stale_recommendations(db: Session, limit: Optional[int] = None) -> List[int]:
+    """Recompute and store recommendations for farmers whose inputs changed."""
+    stale_ids = find_stale_farmers(
+        db,
+        lambda farmer: recommendation_fingerprint(build_farmer_profile(farmer))
+    )
+    if limit is not None:
+        stale_ids = stale_ids[:limit]
+
+    for farmer_id in stale_ids:
+        rescore_farmer(db, db.get(Farmer, farmer_id))
+
+    return stale_ids
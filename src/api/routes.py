@@ -1,28 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
-import pandas as pd
 
 from ..database.database import get_db
+from ..database.farmer_queries import get_farmer_with_history, update_farmer_profile
 from ..database.models import Farmer, Crop, Recommendation, MarketData
-from ..agents.farmer_advisor import FarmerAdvisor, FarmerProfile
-from ..agents.market_researcher import MarketResearcher
+from ..database.recommendation_store import load_recommendations, store_recommendations
+from ..agents.farmer_advisor import FarmerProfile
+from ..agents.regional import normalize_region
+from .jobs import router as jobs_router
+from .pipeline import (
+    build_market_report,
+    build_recommendations,
+    build_sustainable_practices,
+    practices_cache_key
+)
+from .recommendation_service import lookup_farmer_profile, recommendation_fingerprint
+from .shard_router import get_shard_router
+from .single_flight import SingleFlight, normalize_key
 
 router = APIRouter()
+router.include_router(jobs_router)
 
-# Load data (this would be replaced with actual data loading)
-try:
-    farmer_data = pd.read_csv('data/farmer_advisor_dataset.csv')
-    market_data = pd.read_csv('data/market_researcher_dataset.csv')
-except FileNotFoundError:
-    print("Warning: Dataset files not found. Using mock data.")
-    farmer_data = pd.DataFrame()
-    market_data = pd.DataFrame()
+# Concurrent identical requests share one agent pipeline run
+single_flight = SingleFlight()
 
-# Initialize agents
-farmer_advisor = FarmerAdvisor(farmer_data)
-market_researcher = MarketResearcher(market_data)
+# Seconds clients may reuse a sustainable-practices response
+PRACTICES_MAX_AGE = 3600
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header (a list of ETags or ``*``) matches ``etag``."""
+    if not if_none_match:
+        return False
+
+    def opaque(tag: str) -> str:
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        tag = tag.strip()
+        return tag[2:] if tag.startswith('W/') else tag
+
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or opaque(etag) in {opaque(tag) for tag in tags}
 
 @router.post("/farmers/", response_model=dict)
 async def create_farmer(
@@ -35,74 +54,101 @@ async def create_farmer(
         location=farmer.location,
         farm_size=farmer.farm_size,
         soil_type=farmer.soil_type,
-        water_availability=farmer.water_availability
+        water_availability=farmer.water_availability,
+        budget=farmer.budget
     )
     db.add(db_farmer)
     db.commit()
     db.refresh(db_farmer)
     return {"farmer_id": db_farmer.farmer_id, "message": "Farmer profile created successfully"}
 
+@router.put("/farmers/{farmer_id}", response_model=dict)
+async def update_farmer(
+    farmer_id: int,
+    farmer: FarmerProfile,
+    db: Session = Depends(get_db)
+):
+    """Update a farmer profile."""
+    if not update_farmer_profile(db, farmer_id, farmer.model_dump()):
+        raise HTTPException(status_code=404, detail="Farmer not found")
+    return {"farmer_id": farmer_id, "message": "Farmer profile updated successfully"}
+
+@router.get("/farmers/{farmer_id}/history")
+async def get_farmer_history(
+    farmer_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get a farmer's farming history and past recommendations."""
+    farmer = get_farmer_with_history(db, farmer_id)
+    if not farmer:
+        raise HTTPException(status_code=404, detail="Farmer not found")
+    
+    return {
+        "farmer_id": farmer_id,
+        "farming_history": [
+            {
+                "history_id": entry.history_id,
+                "crop_id": entry.crop_id,
+                "planting_date": entry.planting_date,
+                "harvest_date": entry.harvest_date,
+                "yield_amount": entry.yield_amount,
+                "water_used": entry.water_used,
+                "carbon_emissions": entry.carbon_emissions,
+                "notes": entry.notes
+            }
+            for entry in farmer.farming_history
+        ],
+        "recommendations": [
+            {
+                "recommendation_id": rec.recommendation_id,
+                "crop_id": rec.crop_id,
+                "sustainability_score": rec.sustainability_score,
+                "profitability_score": rec.profitability_score,
+                "water_efficiency_score": rec.water_efficiency_score,
+                "recommendation_date": rec.recommendation_date
+            }
+            for rec in farmer.recommendations
+        ],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @router.get("/recommendations/{farmer_id}")
 async def get_recommendations(
     farmer_id: int,
     db: Session = Depends(get_db)
 ):
     """Get farming recommendations for a specific farmer."""
-    farmer = db.query(Farmer).filter(Farmer.farmer_id == farmer_id).first()
-    if not farmer:
+    farmer_profile = lookup_farmer_profile(db, farmer_id)
+    if not farmer_profile:
         raise HTTPException(status_code=404, detail="Farmer not found")
     
-    # Create farmer profile
-    farmer_profile = FarmerProfile(
-        name=farmer.name,
-        location=farmer.location,
-        farm_size=farmer.farm_size,
-        soil_type=farmer.soil_type,
-        water_availability=farmer.water_availability,
-        preferred_crops=None,
-        budget=10000  # This would come from the farmer's actual data
-    )
-    
-    # Get recommendations from both agents
-    crop_recommendations = farmer_advisor.get_crop_recommendations(farmer_profile)
+    # The first fingerprint in a process loads the dataset versions, which can
+    # parse the datasets or start a shard worker; keep that off the event loop
+    loop = asyncio.get_running_loop()
+    fingerprint = await loop.run_in_executor(None, recommendation_fingerprint, farmer_profile)
     
-    # Get market analysis for recommended crops
-    crops = [rec['crop'] for rec in crop_recommendations]
-    market_analysis = market_researcher.generate_market_report(
-        crops,
-        farmer_profile.location,
-        farmer_profile.farm_size
-    )
-    
-    # Combine recommendations
-    final_recommendations = []
-    for crop_rec, market_rec in zip(crop_recommendations, market_analysis):
-        combined_rec = {
-            **crop_rec,
-            'market_analysis': market_rec,
-            'overall_score': (
-                crop_rec['sustainability_score'] * 0.4 +
-                market_rec['recommendation_score'] * 0.6
-            )
+    # Serve the stored result while none of its inputs have changed
+    stored = load_recommendations(db, farmer_id, fingerprint)
+    if stored:
+        recommendations, computed_at = stored
+        return {
+            "farmer_id": farmer_id,
+            "recommendations": recommendations,
+            "timestamp": computed_at.isoformat()
         }
-        final_recommendations.append(combined_rec)
     
-    # Sort by overall score
-    final_recommendations.sort(key=lambda x: x['overall_score'], reverse=True)
-    
-    # Store recommendations in database
-    for rec in final_recommendations[:3]:  # Store top 3 recommendations
-        db_recommendation = Recommendation(
-            farmer_id=farmer_id,
-            crop_id=1,  # This would be the actual crop ID
-            sustainability_score=rec['sustainability_score'],
-            profitability_score=rec['market_analysis']['recommendation_score'],
-            water_efficiency_score=rec['sustainability_metrics'].water_efficiency,
-            details=str(rec)  # Convert to string for storage
+    # Computed on the shard that owns the farmer's region
+    final_recommendations = await single_flight.do(
+        normalize_key('recommendations', fingerprint),
+        lambda: get_shard_router().run(
+            farmer_profile.location,
+            build_recommendations,
+            farmer_profile
         )
-        db.add(db_recommendation)
+    )
     
-    db.commit()
+    # Store recommendations in database
+    store_recommendations(db, farmer_id, fingerprint, final_recommendations)
     
     return {
         "farmer_id": farmer_id,
@@ -120,10 +166,14 @@ async def get_market_analysis(
     if not crops:
         crops = ['rice', 'wheat', 'corn', 'soybeans']  # Default crops
     
-    market_report = market_researcher.generate_market_report(
-        crops=crops,
-        region=region,
-        farm_size=10.0  # Default farm size for analysis
+    # Coalesced callers share one result, so the computation must run on the
+    # same normalized inputs the key is built from
+    region = normalize_region(region)
+    crops = sorted({crop.strip().lower() for crop in crops})
+    
+    market_report = await single_flight.do(
+        normalize_key('market-analysis', region, crops),
+        lambda: get_shard_router().run(region, build_market_report, crops, region)
     )
     
     return {
@@ -136,24 +186,26 @@ async def get_market_analysis(
 async def get_sustainable_practices(
     farmer_id: int,
     crop: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """Get sustainable farming practices for a specific crop."""
-    farmer = db.query(Farmer).filter(Farmer.farmer_id == farmer_id).first()
-    if not farmer:
+    farmer_profile = lookup_farmer_profile(db, farmer_id, preferred_crops=[crop])
+    if not farmer_profile:
         raise HTTPException(status_code=404, detail="Farmer not found")
     
-    farmer_profile = FarmerProfile(
-        name=farmer.name,
-        location=farmer.location,
-        farm_size=farmer.farm_size,
-        soil_type=farmer.soil_type,
-        water_availability=farmer.water_availability,
-        preferred_crops=[crop],
-        budget=10000  # This would come from the farmer's actual data
-    )
+    # Practices only depend on the profile bucket, so clients and proxies
+    # can revalidate instead of refetching
+    etag = f'W/"{practices_cache_key(farmer_profile, crop)}"'
+    cache_headers = {"ETag": etag, "Cache-Control": f"private, max-age={PRACTICES_MAX_AGE}"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
     
-    practices = farmer_advisor.generate_sustainable_practices(
+    practices = await get_shard_router().run(
+        farmer_profile.location,
+        build_sustainable_practices,
         farmer_profile,
         crop
     )
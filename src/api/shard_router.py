@@ -0,0 +1,130 @@
+import asyncio
+import atexit
+import bisect
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..agents.regional import init_shard_worker, normalize_region
+from . import pipeline
+
+# Number of local shard worker processes; 0 runs the agents in-process
+SHARD_WORKERS = int(os.environ.get('FARMING_SHARD_WORKERS', '0'))
+
+# Regions preloaded by their owning shard at boot (comma-separated);
+# other regions are loaded by their shard on first request
+KNOWN_REGIONS = [
+    region for region in os.environ.get('FARMING_REGIONS', '').split(',') if region.strip()
+]
+
+
+class ConsistentHashRing:
+    """Assign keys to nodes so adding a node only moves a fraction of the keys."""
+
+    def __init__(self, nodes: Sequence[str], replicas: int = 100):
+        self._ring: List[int] = []
+        self._nodes: Dict[int, str] = {}
+        for node in nodes:
+            for replica in range(replicas):
+                point = self._hash(f"{node}#{replica}")
+                self._nodes[point] = node
+                bisect.insort(self._ring, point)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+    def node_for(self, key: str) -> str:
+        """Return the node owning ``key``."""
+        if not self._ring:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect.bisect(self._ring, self._hash(key)) % len(self._ring)
+        return self._nodes[self._ring[index]]
+
+
+class ShardOwnership:
+    """Picklable predicate telling a shard worker which regions it owns."""
+
+    def __init__(self, ring: ConsistentHashRing, shard: str):
+        self.ring = ring
+        self.shard = shard
+
+    def __call__(self, region: str) -> bool:
+        return self.ring.node_for(normalize_region(region)) == self.shard
+
+
+class ShardRouter:
+    """Dispatch agent work to the local worker process that owns a region.
+
+    Each shard is a single-process pool whose initializer keeps only the
+    slices of the datasets for the regions assigned to it.
+    """
+
+    def __init__(self, workers: int = SHARD_WORKERS, known_regions: Sequence[str] = KNOWN_REGIONS):
+        self.shards = [f"shard-{index}" for index in range(workers)]
+        self.ring = ConsistentHashRing(self.shards)
+        self._executors: Dict[str, Executor] = {}
+        self._dataset_versions: Optional[Dict[str, str]] = None
+
+        context = multiprocessing.get_context('spawn')
+        for shard in self.shards:
+            owned = [region for region in known_regions if self.shard_for(region) == shard]
+            self._executors[shard] = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=init_shard_worker,
+                initargs=(owned, ShardOwnership(self.ring, shard))
+            )
+
+    def shard_for(self, region: str) -> Optional[str]:
+        """Name of the shard owning ``region``, or None when running in-process."""
+        if not self.shards:
+            return None
+        return self.ring.node_for(normalize_region(region))
+
+    def executor_for(self, region: str) -> Optional[Executor]:
+        """Executor for ``region``; None selects the event loop's default executor."""
+        shard = self.shard_for(region)
+        return self._executors[shard] if shard else None
+
+    async def run(self, region: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the shard that owns ``region``."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor_for(region), func, *args)
+
+    def call(self, region: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Blocking counterpart of ``run`` for background jobs and scripts."""
+        executor = self.executor_for(region)
+        if executor is None:
+            return func(*args)
+        return executor.submit(func, *args).result()
+
+    def dataset_versions(self) -> Dict[str, str]:
+        """Dataset versions the shards serve; every shard loads the same datasets."""
+        if self._dataset_versions is None:
+            if self._executors:
+                executor = self._executors[self.shards[0]]
+                self._dataset_versions = executor.submit(pipeline.dataset_versions).result()
+            else:
+                self._dataset_versions = pipeline.dataset_versions()
+        return self._dataset_versions
+
+    def shutdown(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_router: Optional[ShardRouter] = None
+_router_lock = threading.Lock()
+
+def get_shard_router() -> ShardRouter:
+    """Return the process-wide router, starting the shard workers on first use."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ShardRouter()
+            atexit.register(_router.shutdown)
+        return _router
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent identical computations into a single shared one.
+
+    The first caller for a key starts the computation; callers arriving while
+    it is still running await the same future instead of repeating the work.
+    Nothing is cached once the computation finishes.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run ``func`` for ``key``, or await the call already in flight."""
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shield the shared computation so one cancelled caller does not
+        # cancel it for everyone else waiting on the same key
+        return await asyncio.shield(future)
+
+
+def normalize_key(*parts: Any) -> tuple:
+    """Build a coalescing key that ignores case, whitespace and list ordering."""
+    normalized = []
+    for part in parts:
+        if isinstance(part, str):
+            normalized.append(part.strip().lower())
+        elif isinstance(part, (list, tuple, set, frozenset)):
+            normalized.append(tuple(sorted(normalize_key(*part))))
+        else:
+            normalized.append(part)
+    return tuple(normalized)
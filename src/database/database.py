@@ -1,7 +1,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from contextlib import contextmanager
 
 DATABASE_URL = "sqlite:///farming.db"
 
@@ -14,9 +13,8 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
-@contextmanager
 def get_db():
-    """Context manager for database sessions."""
+    """Yield a database session; used as a FastAPI dependency."""
     db = SessionLocal()
     try:
         yield db
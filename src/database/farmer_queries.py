@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, raiseload, selectinload
+
+from .models import Farmer
+
+# Columns needed to build a farmer's agent profile
+PROFILE_COLUMNS = (
+    Farmer.name,
+    Farmer.location,
+    Farmer.farm_size,
+    Farmer.soil_type,
+    Farmer.water_availability,
+    Farmer.budget
+)
+
+# Names of the profile columns; also the fields a farmer may update
+PROFILE_FIELDS = tuple(column.key for column in PROFILE_COLUMNS)
+
+# Seconds a cached profile is served before it is re-read; bounds how long
+# other processes keep an old profile after an update
+PROFILE_CACHE_TTL = float(os.environ.get('FARMING_PROFILE_CACHE_TTL', '60'))
+
+
+class FarmerProfileCache:
+    """Bounded LRU cache of farmer profile columns keyed by farmer id.
+
+    Entries expire after ``ttl`` seconds, since invalidation only reaches
+    the process that made the update.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = PROFILE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: 'OrderedDict[int, Tuple[float, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, farmer_id: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(farmer_id)
+            if entry is None:
+                return None
+            expires_at, fields = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[farmer_id]
+                return None
+            self._entries.move_to_end(farmer_id)
+            return fields
+
+    def put(self, farmer_id: int, fields: Dict) -> None:
+        with self._lock:
+            self._entries[farmer_id] = (time.monotonic() + self.ttl, fields)
+            self._entries.move_to_end(farmer_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, farmer_id: int) -> None:
+        with self._lock:
+            self._entries.pop(farmer_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Hot profiles for this process; entries are dropped when this process updates
+# a profile and expire after PROFILE_CACHE_TTL otherwise
+profile_cache = FarmerProfileCache()
+
+def get_farmer_profile_fields(db: Session, farmer_id: int) -> Optional[Dict]:
+    """Return the profile columns of a farmer, or None if it does not exist.
+
+    Served from the profile cache when possible; otherwise a single SELECT of
+    just the profile columns, without building an ORM instance.
+    """
+    fields = profile_cache.get(farmer_id)
+    if fields is not None:
+        return dict(fields)
+
+    row = db.execute(
+        select(*PROFILE_COLUMNS).where(Farmer.farmer_id == farmer_id)
+    ).first()
+    if row is None:
+        return None
+
+    fields = dict(row._mapping)
+    profile_cache.put(farmer_id, fields)
+    return dict(fields)
+
+def update_farmer_profile(db: Session, farmer_id: int, fields: Dict) -> bool:
+    """Update a farmer's profile columns; returns False if the farmer does not exist."""
+    values = {name: value for name, value in fields.items() if name in PROFILE_FIELDS}
+    result = db.execute(
+        update(Farmer).where(Farmer.farmer_id == farmer_id).values(**values)
+    )
+    db.commit()
+    profile_cache.invalidate(farmer_id)
+    return result.rowcount > 0
+
+def get_farmer_with_history(db: Session, farmer_id: int) -> Optional[Farmer]:
+    """Load a farmer with its farming history and recommendations eagerly.
+
+    Both collections are fetched with one extra SELECT each; any other
+    relationship access raises instead of silently lazy-loading per row.
+    """
+    return db.execute(
+        select(Farmer)
+        .where(Farmer.farmer_id == farmer_id)
+        .options(
+            selectinload(Farmer.farming_history),
+            selectinload(Farmer.recommendations),
+            raiseload('*')
+        )
+    ).scalars().first()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -14,6 +14,7 @@ class Farmer(Base):
     farm_size = Column(Float, nullable=False)
     soil_type = Column(String(50), nullable=False)
     water_availability = Column(String(50), nullable=False)
+    budget = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     recommendations = relationship("Recommendation", back_populates="farmer")
@@ -56,9 +57,15 @@ class Recommendation(Base):
     water_efficiency_score = Column(Float, nullable=False)
     recommendation_date = Column(DateTime, default=datetime.utcnow)
     details = Column(Text)  # JSON string containing detailed recommendations
+    input_fingerprint = Column(String(64))  # Hash of the inputs the result was computed from
     
     farmer = relationship("Farmer", back_populates="recommendations")
     crop = relationship("Crop", back_populates="recommendations")
+    
+    __table_args__ = (
+        # Stored results are looked up by farmer and fingerprint
+        Index('idx_recommendations_fingerprint', 'farmer_id', 'input_fingerprint'),
+    )
 
 class FarmingHistory(Base):
     __tablename__ = 'farming_history'
@@ -74,4 +81,37 @@ class FarmingHistory(Base):
     notes = Column(Text)
     
     farmer = relationship("Farmer", back_populates="farming_history")
-    crop = relationship("Crop", back_populates="farming_history") 
\ No newline at end of file
+    crop = relationship("Crop", back_populates="farming_history")
+
+class Job(Base):
+    __tablename__ = 'jobs'
+    
+    job_id = Column(String(36), primary_key=True)
+    job_type = Column(String(50), nullable=False)
+    parameters = Column(Text, nullable=False)  # JSON string of the job parameters
+    status = Column(String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    progress = Column(Integer, nullable=False, default=0)
+    total = Column(Integer)
+    chunk_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    owner = Column(String(100))  # host:pid:token of the process running the job
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    result_chunks = relationship("JobResultChunk", back_populates="job")
+
+class JobResultChunk(Base):
+    __tablename__ = 'job_result_chunks'
+    
+    chunk_id = Column(Integer, primary_key=True)
+    job_id = Column(String(36), ForeignKey('jobs.job_id'), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON list of result items
+    
+    job = relationship("Job", back_populates="result_chunks")
+    
+    __table_args__ = (
+        # Chunks are fetched by job and chunk index
+        Index('idx_job_result_chunks_job', 'job_id', 'chunk_index'),
+    )
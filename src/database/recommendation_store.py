@@ -0,0 +1,128 @@
+import json
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, literal, select
+from sqlalchemy.orm import Session
+
+from .models import Farmer, Recommendation
+
+# Serializes check-and-insert between request handlers and job threads of
+# one process; the guarded first insert covers other processes
+_store_lock = threading.Lock()
+
+def load_recommendations(
+    db: Session,
+    farmer_id: int,
+    fingerprint: str
+) -> Optional[Tuple[List[Dict], datetime]]:
+    """Return the stored recommendations computed from ``fingerprint``, if any.
+
+    Each crop is returned once, from the first batch stored for the fingerprint.
+    """
+    rows = db.execute(
+        select(Recommendation.details, Recommendation.recommendation_date)
+        .where(
+            Recommendation.farmer_id == farmer_id,
+            Recommendation.input_fingerprint == fingerprint
+        )
+        .order_by(Recommendation.recommendation_id)
+    ).all()
+    if not rows:
+        return None
+
+    recommendations = []
+    seen_crops = set()
+    for row in rows:
+        rec = json.loads(row.details)
+        if rec.get('crop') in seen_crops:
+            continue
+        seen_crops.add(rec.get('crop'))
+        recommendations.append(rec)
+    return recommendations, rows[0].recommendation_date
+
+def _recommendation_values(
+    farmer_id: int,
+    fingerprint: str,
+    rec: Dict,
+    recommended_at: datetime
+) -> Dict:
+    return {
+        'farmer_id': farmer_id,
+        'crop_id': 1,  # This would be the actual crop ID
+        'sustainability_score': rec['sustainability_score'],
+        'profitability_score': rec['market_analysis']['recommendation_score'],
+        'water_efficiency_score': rec['sustainability_metrics']['water_efficiency'],
+        'recommendation_date': recommended_at,
+        'details': json.dumps(rec),
+        'input_fingerprint': fingerprint
+    }
+
+def store_recommendations(
+    db: Session,
+    farmer_id: int,
+    fingerprint: str,
+    recommendations: List[Dict]
+) -> None:
+    """Persist ranked recommendations under ``fingerprint`` unless already stored.
+
+    The first row is inserted by a single INSERT ... SELECT that only writes
+    when nothing is stored for the fingerprint yet; the write lock it takes
+    holds off other writers until the whole batch is committed.
+    """
+    if not recommendations:
+        return
+
+    recommended_at = datetime.utcnow()
+    rows = [
+        _recommendation_values(farmer_id, fingerprint, rec, recommended_at)
+        for rec in recommendations
+    ]
+    columns = Recommendation.__table__.c
+    already_stored = (
+        select(Recommendation.recommendation_id)
+        .where(
+            Recommendation.farmer_id == farmer_id,
+            Recommendation.input_fingerprint == fingerprint
+        )
+        .exists()
+    )
+
+    with _store_lock:
+        claimed = db.execute(
+            insert(Recommendation).from_select(
+                list(rows[0]),
+                select(*[
+                    literal(value, columns[name].type) for name, value in rows[0].items()
+                ]).where(~already_stored)
+            )
+        )
+        if claimed.rowcount == 0:
+            db.rollback()
+            return
+
+        if len(rows) > 1:
+            db.execute(insert(Recommendation), rows[1:])
+        db.commit()
+
+def find_stale_farmers(
+    db: Session,
+    fingerprint_for: Callable[[Farmer], str]
+) -> List[int]:
+    """Return ids of farmers with no recommendations stored under their current fingerprint.
+
+    ``fingerprint_for`` computes the current fingerprint from a farmer row.
+    This is the same rule ``load_recommendations`` applies, so a profile that
+    changes back to earlier inputs reuses the rows already stored for them.
+    """
+    stored = set(map(tuple, db.execute(
+        select(Recommendation.farmer_id, Recommendation.input_fingerprint).distinct()
+    )))
+    farmers = db.execute(select(Farmer).order_by(Farmer.farmer_id)).scalars()
+
+    return [
+        farmer.farmer_id
+        for farmer in farmers
+        if (farmer.farmer_id, fingerprint_for(farmer)) not in stored
+    ]
@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+# Kept free of third-party imports so it can be loaded before anything heavy
+
+
+class StartupTimer:
+    """Record how long each startup phase takes, in the style of ``-X importtime``."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._phases: List[Tuple[int, str, float, float]] = []
+        self._depth = 0
+        self._child_time = [0.0]
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block; nested phases are reported indented."""
+        index = len(self._phases)
+        self._phases.append((self._depth, name, 0.0, 0.0))
+        self._depth += 1
+        self._child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cumulative = time.perf_counter() - start
+            children = self._child_time.pop()
+            self._depth -= 1
+            self._child_time[-1] += cumulative
+            self._phases[index] = (self._depth, name, cumulative - children, cumulative)
+
+    def report(self) -> str:
+        """Return the breakdown as ``self [us] | cumulative [us] | phase`` lines."""
+        lines = ["startup time: self [us] | cumulative | phase"]
+        for depth, name, self_time, cumulative in self._phases:
+            lines.append(
+                f"startup time: {self_time * 1e6:>9.0f} | {cumulative * 1e6:>10.0f} | "
+                f"{'  ' * depth}{name}"
+            )
+        total = time.perf_counter() - self.started_at
+        lines.append(f"startup time: total {total * 1e6:.0f} us since process start")
+        return "\n".join(lines)
+
+
+# Shared timer for the application process
+startup_timer = StartupTimer()
@@ -0,0 +1,40 @@
+from src.agents import state
+
+
+def write_datasets(directory):
+    farmer_path = directory / 'farmer.csv'
+    market_path = directory / 'market.csv'
+    farmer_path.write_text('Soil_Type,Crop_Type\nLoamy,Rice\n')
+    market_path.write_text('Product,Market_Price_per_ton\nRice,400\n')
+    return str(farmer_path), str(market_path)
+
+
+def test_snapshot_path_depends_on_datasets(tmp_path):
+    (tmp_path / 'root').mkdir()
+    (tmp_path / 'data').mkdir()
+    root = write_datasets(tmp_path / 'root')
+    data = write_datasets(tmp_path / 'data')
+
+    assert state.snapshot_path_for(*root) == state.snapshot_path_for(*root)
+    assert state.snapshot_path_for(*root) != state.snapshot_path_for(*data)
+
+def test_up_to_date_snapshot_is_used(tmp_path):
+    farmer_path, market_path = write_datasets(tmp_path)
+    snapshot_path = state.snapshot_path_for(farmer_path, market_path, str(tmp_path))
+    built = state.build_agent_state(farmer_path, market_path)
+    state.write_state_snapshot(built, snapshot_path)
+
+    loaded = state._read_state_snapshot(snapshot_path, farmer_path, market_path)
+    assert loaded is not None
+    assert loaded.dataset_versions == built.dataset_versions
+
+def test_corrupt_snapshot_falls_back_to_datasets(tmp_path):
+    farmer_path, market_path = write_datasets(tmp_path)
+    snapshot_path = str(tmp_path / 'agent_state.pkl')
+    state.write_state_snapshot(state.build_agent_state(farmer_path, market_path), snapshot_path)
+    with open(snapshot_path, 'r+b') as f:
+        f.truncate(10)
+
+    assert state._read_state_snapshot(snapshot_path, farmer_path, market_path) is None
+    loaded = state.load_agent_state(farmer_path, market_path, snapshot_path)
+    assert len(loaded.farmer_data) == 1
@@ -0,0 +1,136 @@
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api import jobs
+from src.database.models import Base, Job
+
+HOST = socket.gethostname()
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(jobs, 'get_session', factory)
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def queue(session_factory):
+    queue = jobs.JobQueue(workers=1)
+    yield queue
+    queue.shutdown()
+
+@pytest.fixture
+def client(monkeypatch):
+    submitted = []
+
+    class RecordingQueue:
+        def submit(self, job_type, parameters):
+            submitted.append((job_type, parameters))
+            return 'job-1'
+
+    monkeypatch.setattr(jobs, 'get_job_queue', RecordingQueue)
+    app = FastAPI()
+    app.include_router(jobs.router)
+    with TestClient(app) as client:
+        client.submitted = submitted
+        yield client
+
+
+@pytest.fixture
+def live_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    yield process.pid
+    process.kill()
+    process.wait()
+
+@pytest.fixture
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_owner_rules(queue, live_pid, dead_pid):
+    assert queue._owner_is_alive(queue.owner)
+    assert queue._owner_is_alive(f"{HOST}:{live_pid}:abcd1234")
+    assert queue._owner_is_alive("other-host:1:abcd1234")
+
+    # Created before owners were recorded
+    assert not queue._owner_is_alive(None)
+    assert not queue._owner_is_alive("garbage")
+    assert not queue._owner_is_alive(f"{HOST}:{dead_pid}:abcd1234")
+    # An earlier process that had this process's pid
+    assert not queue._owner_is_alive(f"{HOST}:{os.getpid()}:00000000")
+
+def test_new_queue_only_fails_orphaned_jobs(session_factory, live_pid, dead_pid):
+    owners = {
+        'legacy': None,
+        'dead': f"{HOST}:{dead_pid}:abcd1234",
+        'live': f"{HOST}:{live_pid}:abcd1234",
+        'other-host': "other-host:1:abcd1234"
+    }
+    db = session_factory()
+    try:
+        for job_id, owner in owners.items():
+            db.add(Job(job_id=job_id, job_type='rescore_farmers', parameters='{}', status='running', owner=owner))
+        db.add(Job(job_id='done', job_type='rescore_farmers', parameters='{}', status='completed'))
+        db.commit()
+
+        jobs.JobQueue(workers=1).shutdown()
+
+        db.expire_all()
+        statuses = {job.job_id: job.status for job in db.query(Job)}
+    finally:
+        db.close()
+
+    assert statuses == {
+        'legacy': 'failed',
+        'dead': 'failed',
+        'live': 'running',
+        'other-host': 'running',
+        'done': 'completed'
+    }
+
+@pytest.mark.parametrize('job_type, parameters', [
+    ('unknown', {}),
+    ('region_report', {}),
+    ('region_report', {'region': '  '}),
+    ('region_report', {'region': 'Karnataka', 'crops': 'rice'}),
+    ('rescore_farmers', {}),
+    ('rescore_farmers', {'farmer_ids': []}),
+    ('rescore_farmers', {'farmer_ids': ['1']}),
+    ('rescore_farmers', {'farmer_ids': [True]}),
+    ('rescore_farmers', {'farmer_ids': 5}),
+    ('rescore_farmers', {'region': 5})
+])
+def test_invalid_jobs_are_rejected_before_queueing(client, job_type, parameters):
+    response = client.post('/jobs', json={'job_type': job_type, 'parameters': parameters})
+    assert response.status_code == 400
+    assert client.submitted == []
+
+@pytest.mark.parametrize('job_type, parameters', [
+    ('region_report', {'region': 'Karnataka'}),
+    ('region_report', {'region': 'Karnataka', 'crops': ['rice']}),
+    ('rescore_farmers', {'farmer_ids': [1, 2]}),
+    ('rescore_farmers', {'region': 'Karnataka'})
+])
+def test_valid_jobs_are_queued(client, job_type, parameters):
+    response = client.post('/jobs', json={'job_type': job_type, 'parameters': parameters})
+    assert response.status_code == 202
+    assert client.submitted == [(job_type, parameters)]
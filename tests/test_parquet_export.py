@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.analytics.parquet_export import export_snapshots
+from src.analytics.snapshot_query import average_scores_by, load_snapshot
+from src.database.models import Base, Farmer
+from src.database.recommendation_store import store_recommendations
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'farming.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def test_exports_pick_up_new_rows_and_profile_edits(engine, tmp_path):
+    export_dir = str(tmp_path / 'exports')
+    db = sessionmaker(bind=engine)()
+    try:
+        farmer = Farmer(
+            name='Test Farmer',
+            location='Karnataka',
+            farm_size=10.0,
+            soil_type='loamy',
+            water_availability='medium'
+        )
+        db.add(farmer)
+        db.commit()
+        store_recommendations(db, farmer.farmer_id, 'fingerprint', [{
+            'crop': 'rice',
+            'sustainability_score': 0.5,
+            'market_analysis': {'recommendation_score': 0.4},
+            'sustainability_metrics': {'water_efficiency': 0.3}
+        }])
+
+        assert export_snapshots(engine, export_dir, batch_size=1)['recommendations'] == 1
+        assert [row['soil_type'] for row in average_scores_by(export_dir=export_dir)] == ['loamy']
+
+        farmer.soil_type = 'clay'
+        db.commit()
+        exported = export_snapshots(engine, export_dir, batch_size=1)
+    finally:
+        db.close()
+
+    # Recommendations are incremental; farmers are re-exported in full
+    assert exported == {'farmers': 1, 'recommendations': 0, 'farming_history': 0}
+    assert load_snapshot('farmers', export_dir).num_rows == 1
+    assert [row['soil_type'] for row in average_scores_by(export_dir=export_dir)] == ['clay']
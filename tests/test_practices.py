@@ -0,0 +1,42 @@
+import pytest
+
+from src.agents.practices_catalog import load_catalog
+from src.api.routes import _etag_matches
+
+ETAG = 'W/"abc123"'
+
+
+@pytest.mark.parametrize('header', [
+    'W/"abc123"',
+    '"abc123"',
+    '"other", W/"abc123"',
+    'W/"other" ,  "abc123" ',
+    '*'
+])
+def test_etag_matches(header):
+    assert _etag_matches(header, ETAG)
+
+@pytest.mark.parametrize('header', [
+    None,
+    '',
+    '"other"',
+    'W/"other", "abc1234"',
+    '"abc"'
+])
+def test_etag_does_not_match(header):
+    assert not _etag_matches(header, ETAG)
+
+def test_unknown_buckets_are_ranked_without_growing_the_index():
+    catalog = load_catalog()
+    indexed = len(catalog._index)
+
+    for index in range(100):
+        bucket = catalog.bucket(f"crop-{index}", 'loamy', 'medium')
+        assert list(catalog.lookup(bucket)) == list(catalog._rank(bucket))
+
+    assert len(catalog._index) == indexed
+
+def test_known_buckets_are_served_from_the_index():
+    catalog = load_catalog()
+    bucket = catalog.bucket(' Rice ', 'Loamy', 'MEDIUM')
+    assert catalog.lookup(bucket) is catalog._index[('rice', 'loamy', 'medium')]
@@ -0,0 +1,155 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.routes import router
+from src.database import database
+from src.database.farmer_queries import (
+    FarmerProfileCache,
+    get_farmer_profile_fields,
+    profile_cache
+)
+from src.database.models import Base, Crop, Farmer, FarmingHistory
+
+
+class QueryCounter:
+    """Count the SQL statements an engine executes."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def reset(self) -> None:
+        self.count = 0
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def farmer_id(session_factory):
+    profile_cache.clear()
+    db = session_factory()
+    try:
+        db.add(Crop(
+            crop_id=1,
+            name='Rice',
+            water_requirement=1500,
+            carbon_footprint=2.7,
+            soil_suitability='clay,loamy',
+            growth_period_days=120
+        ))
+        farmer = Farmer(
+            name='Test Farmer',
+            location='Karnataka',
+            farm_size=10.0,
+            soil_type='loamy',
+            water_availability='medium',
+            budget=5000
+        )
+        db.add(farmer)
+        db.flush()
+        for _ in range(5):
+            db.add(FarmingHistory(
+                farmer_id=farmer.farmer_id,
+                crop_id=1,
+                planting_date=datetime(2024, 6, 1)
+            ))
+        db.commit()
+        yield farmer.farmer_id
+    finally:
+        db.close()
+        profile_cache.clear()
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    # Requests go through the real get_db dependency, bound to the test engine
+    monkeypatch.setattr(database, 'SessionLocal', session_factory)
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def queries(engine):
+    return QueryCounter(engine)
+
+
+def test_profile_lookup_is_one_query_cold_and_none_cached(session_factory, farmer_id, queries):
+    db = session_factory()
+    try:
+        queries.reset()
+        assert get_farmer_profile_fields(db, farmer_id)['budget'] == 5000
+        assert queries.count == 1
+
+        queries.reset()
+        assert get_farmer_profile_fields(db, farmer_id)['budget'] == 5000
+        assert queries.count == 0
+    finally:
+        db.close()
+
+def test_farmer_history_is_three_queries(client, farmer_id, queries):
+    queries.reset()
+    response = client.get(f"/farmers/{farmer_id}/history")
+
+    assert response.status_code == 200
+    assert len(response.json()['farming_history']) == 5
+    # Farmer, then one SELECT each for history and recommendations
+    assert queries.count == 3
+
+def test_stored_recommendations_are_one_query(client, farmer_id, queries):
+    first = client.get(f"/recommendations/{farmer_id}")
+    assert first.status_code == 200
+
+    queries.reset()
+    stored = client.get(f"/recommendations/{farmer_id}")
+
+    assert stored.status_code == 200
+    assert stored.json()['recommendations'] == first.json()['recommendations']
+    # Profile served from the cache; only the stored result is read
+    assert queries.count == 1
+
+def test_update_farmer_refreshes_cached_profile(client, session_factory, farmer_id, queries):
+    profile = {
+        'name': 'Test Farmer',
+        'location': 'Karnataka',
+        'farm_size': 12.0,
+        'soil_type': 'loamy',
+        'water_availability': 'medium',
+        'budget': 8000
+    }
+    assert client.get(f"/recommendations/{farmer_id}").status_code == 200
+    assert client.put(f"/farmers/{farmer_id}", json=profile).status_code == 200
+
+    db = session_factory()
+    try:
+        queries.reset()
+        assert get_farmer_profile_fields(db, farmer_id)['budget'] == 8000
+        assert queries.count == 1
+    finally:
+        db.close()
+
+def test_cached_profiles_expire():
+    cache = FarmerProfileCache(ttl=0)
+    cache.put(1, {'budget': 5000})
+    assert cache.get(1) is None
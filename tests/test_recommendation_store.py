@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.database.models import Base, Farmer, Recommendation
+from src.database.recommendation_store import (
+    find_stale_farmers,
+    load_recommendations,
+    store_recommendations
+)
+
+
+def make_recommendations(*crops):
+    return [
+        {
+            'crop': crop,
+            'sustainability_score': 0.5,
+            'market_analysis': {'recommendation_score': 0.4},
+            'sustainability_metrics': {'water_efficiency': 0.3}
+        }
+        for crop in crops
+    ]
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file database, so concurrent writers use separate connections
+    engine = create_engine(f"sqlite:///{tmp_path / 'farming.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def farmer_id(session_factory):
+    db = session_factory()
+    try:
+        farmer = Farmer(
+            name='Test Farmer',
+            location='Karnataka',
+            farm_size=10.0,
+            soil_type='loamy',
+            water_availability='medium'
+        )
+        db.add(farmer)
+        db.commit()
+        return farmer.farmer_id
+    finally:
+        db.close()
+
+
+def test_concurrent_stores_keep_one_batch(session_factory, farmer_id):
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def store(crops):
+        db = session_factory()
+        try:
+            barrier.wait()
+            store_recommendations(db, farmer_id, 'fingerprint', make_recommendations(*crops))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    threads = [
+        threading.Thread(target=store, args=(('rice', 'wheat', 'corn'),))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db = session_factory()
+    try:
+        assert errors == []
+        assert len(db.execute(select(Recommendation.recommendation_id)).all()) == 3
+        recommendations, _ = load_recommendations(db, farmer_id, 'fingerprint')
+        assert [rec['crop'] for rec in recommendations] == ['rice', 'wheat', 'corn']
+    finally:
+        db.close()
+
+def test_load_serves_each_crop_once(session_factory, farmer_id):
+    db = session_factory()
+    try:
+        # Rows written twice for one fingerprint, e.g. before writes were guarded
+        for crops in (('rice', 'wheat'), ('wheat', 'rice')):
+            store_recommendations(db, farmer_id, 'new', make_recommendations(*crops))
+            db.execute(
+                Recommendation.__table__.update()
+                .where(Recommendation.input_fingerprint == 'new')
+                .values(input_fingerprint='fingerprint')
+            )
+            db.commit()
+
+        recommendations, _ = load_recommendations(db, farmer_id, 'fingerprint')
+        assert [rec['crop'] for rec in recommendations] == ['rice', 'wheat']
+    finally:
+        db.close()
+
+def test_farmer_is_fresh_while_current_fingerprint_is_stored(session_factory, farmer_id):
+    db = session_factory()
+    try:
+        assert find_stale_farmers(db, lambda farmer: 'a') == [farmer_id]
+
+        store_recommendations(db, farmer_id, 'a', make_recommendations('rice'))
+        store_recommendations(db, farmer_id, 'b', make_recommendations('rice'))
+
+        # Changing back to earlier inputs reuses the rows stored for them
+        assert find_stale_farmers(db, lambda farmer: 'a') == []
+        assert find_stale_farmers(db, lambda farmer: 'c') == [farmer_id]
+    finally:
+        db.close()
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from src.agents import regional, state
+from src.api.shard_router import ConsistentHashRing, ShardOwnership, ShardRouter
+
+REGIONS = [f"region-{index}" for index in range(2000)]
+
+
+def test_assignment_is_stable_across_rings():
+    first = ConsistentHashRing(['shard-0', 'shard-1', 'shard-2'])
+    second = ConsistentHashRing(['shard-2', 'shard-0', 'shard-1'])
+    assert [first.node_for(region) for region in REGIONS] == \
+        [second.node_for(region) for region in REGIONS]
+
+def test_every_node_gets_a_share_of_keys():
+    ring = ConsistentHashRing(['shard-0', 'shard-1', 'shard-2'])
+    counts = {}
+    for region in REGIONS:
+        node = ring.node_for(region)
+        counts[node] = counts.get(node, 0) + 1
+    assert set(counts) == {'shard-0', 'shard-1', 'shard-2'}
+    assert min(counts.values()) > len(REGIONS) / 3 * 0.6
+
+def test_adding_a_node_only_moves_keys_to_it():
+    before = ConsistentHashRing(['shard-0', 'shard-1', 'shard-2'])
+    after = ConsistentHashRing(['shard-0', 'shard-1', 'shard-2', 'shard-3'])
+
+    moved = [region for region in REGIONS if before.node_for(region) != after.node_for(region)]
+    assert all(after.node_for(region) == 'shard-3' for region in moved)
+    # Roughly a quarter of the keys move to the new node, not a full reshuffle
+    assert 0.15 < len(moved) / len(REGIONS) < 0.35
+
+def test_empty_ring_raises():
+    with pytest.raises(ValueError):
+        ConsistentHashRing([]).node_for('karnataka')
+
+def test_ownership_ignores_region_case():
+    ring = ConsistentHashRing(['shard-0', 'shard-1'])
+    owner = ring.node_for('karnataka')
+    assert ShardOwnership(ring, owner)(' Karnataka ')
+
+def test_router_without_workers_runs_in_process():
+    router = ShardRouter(workers=0, known_regions=[])
+    assert router.shard_for('karnataka') is None
+    assert router.executor_for('karnataka') is None
+    assert router.call('karnataka', sum, [1, 2]) == 3
+
+
+@pytest.fixture
+def regional_state(monkeypatch):
+    farmer_data = pd.DataFrame({
+        'Region': ['North', 'south', 'North', 'East'],
+        'Soil_Type': ['Loamy', 'Clay', 'Sandy', 'Silt']
+    })
+    market_data = pd.DataFrame({'Product': ['Rice'], 'Market_Price_per_ton': [400]})
+    agent_state = state.AgentState(farmer_data, market_data, {'farmer_advisor': 'v1'}, {})
+    reads = []
+
+    def read_agent_state():
+        reads.append(1)
+        return agent_state
+
+    monkeypatch.setattr(regional, 'read_agent_state', read_agent_state)
+    monkeypatch.setattr(regional, 'load_agent_state', read_agent_state)
+    monkeypatch.setattr(regional, '_region_agents', {})
+    monkeypatch.setattr(regional, '_dataset_regions', None)
+    monkeypatch.setattr(regional, '_dataset_versions', None)
+    monkeypatch.setattr(regional, '_keep_full_state', True)
+    return reads
+
+
+def test_unknown_regions_share_one_set_of_agents(regional_state):
+    for region in ['north', ' NORTH ', 'mars', 'venus', 'a' * 50]:
+        regional.region_agents(region)
+
+    assert sorted(regional._region_agents) == [regional.OTHER_REGIONS, 'north']
+    assert regional.region_agents('mars') is regional.region_agents('venus')
+    assert len(regional.region_agents('north')[0].historical_data) == 2
+    assert len(regional.region_agents('mars')[0].historical_data) == 0
+
+def test_shard_worker_keeps_only_owned_slices(regional_state):
+    regional.init_shard_worker(['north'], owns=lambda region: region == 'east')
+
+    assert regional_state == [1]
+    assert sorted(regional._region_agents) == [regional.OTHER_REGIONS, 'east', 'north']
+    assert all(len(advisor.historical_data) < 4 for advisor, _ in regional._region_agents.values())
+    # Versions are remembered, so serving them does not read the datasets again
+    assert regional.dataset_versions() == {'farmer_advisor': 'v1'}
+    regional.region_agents('mars')
+    assert regional_state == [1]
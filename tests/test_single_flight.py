@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from src.api.single_flight import SingleFlight, normalize_key
+
+
+def test_concurrent_calls_share_one_computation():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ['rice']
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do('key', compute) for _ in range(10)))
+        return flight, results
+
+    flight, results = asyncio.run(main())
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    # Nothing is cached once the computation finishes
+    assert flight._in_flight == {}
+
+def test_calls_after_completion_recompute():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def main():
+        flight = SingleFlight()
+        return await flight.do('key', compute), await flight.do('key', compute)
+
+    assert asyncio.run(main()) == (1, 2)
+
+def test_distinct_keys_do_not_coalesce():
+    calls = []
+
+    async def main():
+        flight = SingleFlight()
+
+        def compute(key):
+            async def run():
+                calls.append(key)
+                await asyncio.sleep(0.01)
+                return key
+            return run
+
+        return await asyncio.gather(flight.do('a', compute('a')), flight.do('b', compute('b')))
+
+    assert asyncio.run(main()) == ['a', 'b']
+    assert sorted(calls) == ['a', 'b']
+
+def test_cancelled_caller_does_not_cancel_shared_computation():
+    release = None
+
+    async def compute():
+        await release.wait()
+        return 'done'
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do('key', compute))
+        second = asyncio.ensure_future(flight.do('key', compute))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == 'done'
+
+def test_errors_reach_every_waiter():
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    async def main():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.do('key', compute),
+            flight.do('key', compute),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_normalize_key_ignores_case_whitespace_and_order():
+    assert normalize_key('market-analysis', ' Karnataka ', ['Wheat', 'rice']) == \
+        normalize_key('market-analysis', 'karnataka', ['rice', 'WHEAT'])
+    assert normalize_key('a', ['rice']) != normalize_key('a', ['wheat'])